@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark the upload scripts against the local Storage emulator
+
+Starts supabase_emulator.py in-process with the requested network conditions,
+runs each uploader over optimized/ and reports throughput and per-file
+latency percentiles.
+"""
+
+import argparse
+import contextlib
+import io
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from media_catalog import list_optimized_files
+from supabase_emulator import StorageEmulator, start_emulator
+
+# (module, upload function, directories passed to upload_directory)
+UPLOADERS = [
+    ("upload_to_supabase", "upload_file", [
+        ("optimized/images", "portfolio-images", "images"),
+        ("optimized/project-images", "portfolio-images", "project-images"),
+        ("optimized/videos", "portfolio-videos", "videos"),
+    ]),
+    ("upload_media", "upload_file_to_supabase", [
+        ("optimized/images", "portfolio-images", ""),
+        ("optimized/project-images", "portfolio-images", ""),
+        ("optimized/videos", "portfolio-videos", ""),
+    ]),
+    ("upload_and_update", "upload_file_to_supabase", [
+        ("optimized/images", "portfolio-images", ""),
+        ("optimized/project-images", "portfolio-images", ""),
+        ("optimized/videos", "portfolio-videos", ""),
+    ]),
+]
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+def run_uploader(module_name, function_name, sources, base_url, workers):
+    """Upload everything with one script, returns per-file results and wall time"""
+    # Import after SUPABASE_URL is set so module-level config picks it up
+    module = __import__(module_name)
+    module.SUPABASE_URL = base_url
+    module.SUPABASE_ANON_KEY = "emulator"
+    upload = getattr(module, function_name)
+    results = []
+
+    def timed_upload(file_path, bucket_name, file_name):
+        start = time.perf_counter()
+        ok = upload(file_path, bucket_name, file_name)
+        results.append((time.perf_counter() - start, Path(file_path).stat().st_size, ok))
+        return ok
+
+    start = time.perf_counter()
+    # The scripts print a line per file; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        if workers > 1:
+            jobs = [(path, bucket_name, key)
+                    for dir_path, bucket_name, base_path in sources if Path(dir_path).exists()
+                    for path, relative_path in list_optimized_files(dir_path)
+                    for key in [f"{base_path}/{relative_path}" if base_path else relative_path]]
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(lambda job: timed_upload(*job), jobs))
+        else:
+            # Run the script's own directory walk, timing each upload it makes
+            setattr(module, function_name, timed_upload)
+            try:
+                for dir_path, bucket_name, base_path in sources:
+                    module.upload_directory(dir_path, bucket_name, base_path)
+            finally:
+                setattr(module, function_name, upload)
+    return results, time.perf_counter() - start
+
+def format_rate(kbps):
+    return f"{kbps:g}kbps" if kbps else "unlimited"
+
+def print_report(name, results, elapsed, stats):
+    """Throughput and latency summary for one uploader"""
+    latencies = [duration * 1000 for duration, _, _ in results]
+    uploaded = [size for _, size, ok in results if ok]
+    failed = len(results) - len(uploaded)
+    megabytes = sum(uploaded) / (1024 * 1024)
+
+    print(f"\n📊 {name}")
+    print(f"  Files: {len(uploaded)} uploaded, {failed} failed "
+          f"({stats['injected_errors']} injected errors)")
+    print(f"  Data: {megabytes:.1f}MB in {elapsed:.2f}s")
+    print(f"  Throughput: {megabytes / elapsed if elapsed else 0:.2f} MB/s, "
+          f"{len(results) / elapsed if elapsed else 0:.1f} files/s")
+    print(f"  Latency: p50 {percentile(latencies, 50):.0f}ms, p95 {percentile(latencies, 95):.0f}ms, "
+          f"p99 {percentile(latencies, 99):.0f}ms, max {max(latencies, default=0):.0f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark uploaders against the Storage emulator")
+    parser.add_argument("--latency-ms", type=float, default=40)
+    parser.add_argument("--jitter-ms", type=float, default=10)
+    parser.add_argument("--bandwidth-kbps", type=float, default=50000,
+                        help="per-connection cap, 0 for none")
+    parser.add_argument("--total-bandwidth-kbps", type=float, default=0,
+                        help="cap shared by all connections, 0 for none")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-concurrency", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="parallel uploads; 1 runs each script's own sequential walk")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--only", choices=[name for name, _, _ in UPLOADERS], action="append",
+                        help="benchmark just these uploaders")
+    args = parser.parse_args()
+
+    if not Path("optimized").exists():
+        print("❌ Optimized directory not found. Run compression scripts first.")
+        return
+
+    emulator = StorageEmulator(args.latency_ms, args.jitter_ms, args.bandwidth_kbps,
+                               args.error_rate, args.max_concurrency, args.seed,
+                               total_bandwidth_kbps=args.total_bandwidth_kbps)
+    server, base_url = start_emulator(emulator)
+    os.environ["SUPABASE_URL"] = base_url
+
+    print(f"🧪 Emulator at {base_url}: {args.latency_ms:g}±{args.jitter_ms:g}ms latency, "
+          f"{format_rate(args.bandwidth_kbps)} per connection, "
+          f"{format_rate(args.total_bandwidth_kbps)} total, {args.error_rate:.0%} errors, "
+          f"concurrency limit {args.max_concurrency or 'none'}, {args.workers} worker(s)")
+
+    try:
+        for name, function_name, sources in UPLOADERS:
+            if args.only and name not in args.only:
+                continue
+            emulator.reset()
+            results, elapsed = run_uploader(name, function_name, sources, base_url, args.workers)
+            print_report(name, results, elapsed, emulator.stats)
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Pick the compression route for an image and write palette PNG fallbacks
+
+Used by compress_images.sh:
+    python3 classify_image.py classify INPUT
+        prints "alpha", "palette" or "photo"
+    python3 classify_image.py quantize INPUT OUTPUT MAX_WIDTH
+        writes a palette-quantized, optimized PNG
+
+Transparent and flat-colour images go to lossless WebP with a palette PNG
+fallback; everything else keeps the WebP + JPEG route. Needs Pillow and NumPy;
+without them every image is treated as a photo.
+"""
+
+import sys
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    np = None
+    Image = None
+
+# An image is "palette" if this many colours cover enough of its pixels
+PALETTE_COLOURS = 256
+PALETTE_COVERAGE = 0.98
+
+def load_rgba(file_path):
+    """Decode an image to an RGBA pixel array"""
+    with Image.open(file_path) as img:
+        img.load()
+        return np.asarray(img.convert("RGBA"))
+
+def has_alpha(pixels):
+    """True if any pixel is not fully opaque"""
+    return bool((pixels[..., 3] < 255).any())
+
+def palette_coverage(pixels):
+    """Fraction of pixels covered by the most common PALETTE_COLOURS colours"""
+    rgb = pixels[..., :3].reshape(-1, 3).astype(np.uint32)
+    packed = (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]
+    _, counts = np.unique(packed, return_counts=True)
+    if len(counts) <= PALETTE_COLOURS:
+        return 1.0
+    top = np.partition(counts, -PALETTE_COLOURS)[-PALETTE_COLOURS:]
+    return float(top.sum()) / len(packed)
+
+def classify(file_path):
+    """'alpha', 'palette' or 'photo'"""
+    if np is None:
+        print("⚠️  Pillow/NumPy not installed, using the JPEG route", file=sys.stderr)
+        return "photo"
+    pixels = load_rgba(file_path)
+    if has_alpha(pixels):
+        return "alpha"
+    if palette_coverage(pixels) >= PALETTE_COVERAGE:
+        return "palette"
+    return "photo"
+
+def quantize(file_path, output_path, max_width):
+    """Write a resized, palette-quantized PNG (keeps partial transparency)"""
+    with Image.open(file_path) as img:
+        img = img.convert("RGBA")
+        if img.width > max_width:
+            img = img.resize((max_width, round(img.height * max_width / img.width)), Image.LANCZOS)
+        # FASTOCTREE is the built-in quantizer that supports RGBA
+        quantized = img.quantize(colors=PALETTE_COLOURS, method=Image.Quantize.FASTOCTREE,
+                                 dither=Image.Dither.FLOYDSTEINBERG)
+        quantized.save(output_path, optimize=True)
+
+def main():
+    if len(sys.argv) == 3 and sys.argv[1] == "classify":
+        print(classify(sys.argv[2]))
+    elif len(sys.argv) == 5 and sys.argv[1] == "quantize":
+        if np is None:
+            sys.exit("❌ Pillow and NumPy are required to quantize PNGs")
+        quantize(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+    else:
+        sys.exit(__doc__)
+
+if __name__ == "__main__":
+    main()
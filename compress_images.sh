@@ -2,6 +2,7 @@
 
 # Image compression script for portfolio optimization
 # Creates WebP and optimized JPEG versions of all images
+# (transparent and flat-colour PNGs get a palette PNG instead of a JPEG)
 
 echo "Starting image compression..."
 
@@ -39,7 +40,57 @@ compress_image() {
     else
         local resize_cmd=""
     fi
-    
+
+    # Transparent and flat-colour PNGs get lossless WebP plus a palette PNG
+    # fallback, so they keep their alpha and sharp edges
+    local route="photo"
+    if [[ "$ext" == "png" || "$ext" == "PNG" ]]; then
+        route=$(python3 classify_image.py classify "$input_file") || route=photo
+    fi
+    # Anything unexpected (e.g. an image Pillow can't decode) keeps the JPEG
+    # route, so the existing fallback is never removed
+    case "$route" in
+        alpha|palette|photo) ;;
+        *)
+            echo "  ⚠️  Could not classify $input_file, using the JPEG route"
+            route=photo
+            ;;
+    esac
+
+    # Write the palette PNG first; if that fails the JPEG route still runs
+    if [ "$route" != "photo" ] && \
+       ! python3 classify_image.py quantize "$input_file" "optimized/$output_dir/${name}.png" "$max_width"; then
+        echo "  ⚠️  Could not quantize $input_file, using the JPEG route"
+        route=photo
+    fi
+
+    if [ "$route" != "photo" ]; then
+        convert "$input_file" $resize_cmd -define webp:lossless=true -strip "optimized/$output_dir/${name}.webp"
+        # Drop a JPEG left over from an earlier run so the HTML picks the PNG
+        rm -f "optimized/$output_dir/${name}.jpg"
+
+        # Build the JPEG route in a temp dir to compare sizes
+        local tmp_dir=$(mktemp -d)
+        convert "$input_file" $resize_cmd -quality 80 -strip "$tmp_dir/${name}.webp"
+        convert "$input_file" $resize_cmd -quality 85 -strip -interlace Plane "$tmp_dir/${name}.jpg"
+
+        local webp_size=$(stat -f%z "optimized/$output_dir/${name}.webp")
+        local png_size=$(stat -f%z "optimized/$output_dir/${name}.png")
+        local jpeg_route_webp=$(stat -f%z "$tmp_dir/${name}.webp")
+        local jpeg_route_jpg=$(stat -f%z "$tmp_dir/${name}.jpg")
+        rm -rf "$tmp_dir"
+
+        echo "  Route: $route (lossless WebP + palette PNG)"
+        echo "  WebP: $(numfmt --to=iec $webp_size) (JPEG route: $(numfmt --to=iec $jpeg_route_webp))"
+        echo "  PNG: $(numfmt --to=iec $png_size) (JPEG route: $(numfmt --to=iec $jpeg_route_jpg))"
+        echo "  Fallback bytes vs JPEG route: $((png_size - jpeg_route_jpg))"
+        echo ""
+        return
+    fi
+
+    # Drop a palette PNG left over from an earlier run so the HTML picks the JPEG
+    rm -f "optimized/$output_dir/${name}.png"
+
     # Create WebP version (modern format, 80% quality)
     convert "$input_file" $resize_cmd -quality 80 -strip "optimized/$output_dir/${name}.webp"
     
@@ -80,4 +131,11 @@ done
 echo "Image compression complete!"
 echo "Total size reduction:"
 du -sh images/ project-images/
-du -sh optimized/images/ optimized/project-images/
\ No newline at end of file
+du -sh optimized/images/ optimized/project-images/
+
+# Refresh the media catalog with the new variants
+python3 media_catalog.py build
+
+# Switch existing Supabase <img> fallbacks to the .jpg/.png just produced
+# (this also regenerates the service worker with the new content hashes)
+python3 generate_supabase_html.py --retarget-fallbacks
\ No newline at end of file
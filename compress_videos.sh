@@ -86,4 +86,10 @@ done
 echo "Video compression complete!"
 echo "Total size reduction:"
 du -sh videos/ images/*.{mp4,mov,MOV,MP4} 2>/dev/null || du -sh videos/
-du -sh optimized/videos/
\ No newline at end of file
+du -sh optimized/videos/
+
+# Refresh the media catalog with the new variants
+python3 media_catalog.py build
+
+# Pick up the new content hashes in the service worker
+python3 generate_service_worker.py
\ No newline at end of file
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Generate sw.js with a precache manifest for repeat visits
+
+The manifest lists the stylesheet, scripts and each page's above-the-fold
+images, each with a content hash. The cache version is a hash of the manifest,
+so it only changes when one of those files changes.
+
+Storage images are cached at runtime under their content hash as well, so an
+image re-uploaded under the same key is fetched again. Rerun this script after
+changing CSS, JS or media; the compression scripts and
+generate_supabase_html.py do it for you.
+"""
+
+import hashlib
+import json
+from html.parser import HTMLParser
+from pathlib import Path
+
+from media_catalog import (CATALOG_PATH, HTML_FILES, SYNC_SOURCES, file_md5,
+                           get_variant_by_key, list_optimized_files, open_catalog,
+                           resolve_page_path)
+
+SERVICE_WORKER_PATH = "sw.js"
+
+# How many images at the top of each page get precached
+ABOVE_THE_FOLD_IMAGES = 2
+
+# Only this bucket is cached at runtime; videos use range requests
+MEDIA_BUCKET = "portfolio-images"
+
+# Runtime-cached images are evicted least recently used first
+MEDIA_MAX_ENTRIES = 100
+MEDIA_MAX_BYTES = 25 * 1024 * 1024
+GALLERY_PATTERN = r"/images/fun\d+\.(webp|jpg|png)$"
+GALLERY_MAX_ENTRIES = 60
+GALLERY_MAX_BYTES = 15 * 1024 * 1024
+
+STORAGE_PATH = "/storage/v1/object/public/"
+
+class PageAssetParser(HTMLParser):
+    """Collect local stylesheets/scripts and the first images of a page"""
+
+    def __init__(self):
+        super().__init__()
+        self.assets = []
+        self.images = []
+        self.webp_source = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "link" and attrs.get("rel") == "stylesheet":
+            self.assets.append(attrs.get("href"))
+        elif tag == "script" and attrs.get("src"):
+            self.assets.append(attrs["src"])
+        elif tag == "source" and attrs.get("type") == "image/webp":
+            self.webp_source = attrs.get("srcset")
+        elif tag == "img" and attrs.get("src"):
+            # Browsers fetch the WebP <source> instead of the <img> fallback
+            self.images.append(self.webp_source or attrs["src"])
+            self.webp_source = None
+
+    def handle_endtag(self, tag):
+        if tag == "picture":
+            self.webp_source = None
+
+def is_external(url):
+    return not url or "://" in url or url.startswith("//")
+
+def precache_url(page_path, url):
+    """Site-relative URL of a same-origin asset, keeping its ?v= cache buster"""
+    path = resolve_page_path(page_path, url)
+    query = url.split("#")[0].partition("?")[2]
+    return f"{path}?{query}" if query else path
+
+def remote_revision(catalog, url):
+    """Content hash of a Supabase Storage object, from the catalog or optimized/"""
+    if STORAGE_PATH not in url:
+        return None
+    bucket_name, _, key = url.split(STORAGE_PATH, 1)[1].partition("/")
+    key = key.split("?")[0]
+
+    if catalog is not None:
+        row = get_variant_by_key(catalog, bucket_name, key)
+        if row is not None:
+            return row["md5"][:12]
+
+    for dir_path, source_bucket, base_path in SYNC_SOURCES:
+        if source_bucket == bucket_name and key.startswith(f"{base_path}/"):
+            local = Path(dir_path) / key[len(base_path) + 1:]
+            if local.exists():
+                return file_md5(local)[:12]
+    return None
+
+def build_manifest(catalog=None):
+    """Precache entries sorted by URL, each with a content revision"""
+    entries = {}
+
+    for html_file in HTML_FILES:
+        if not Path(html_file).exists():
+            continue
+        parser = PageAssetParser()
+        with open(html_file, 'r', encoding='utf-8') as f:
+            parser.feed(f.read())
+
+        # Keyed with the page's ?v= so bumping it bypasses the precached copy
+        for url in parser.assets:
+            if is_external(url):
+                continue
+            path = resolve_page_path(html_file, url)
+            if Path(path).exists():
+                entries[precache_url(html_file, url)] = file_md5(path)[:12]
+
+        for url in parser.images[:ABOVE_THE_FOLD_IMAGES]:
+            if is_external(url):
+                revision = remote_revision(catalog, url)
+                if revision is None:
+                    print(f"⚠️  Not precaching {url}: no local variant to hash")
+                    continue
+                entries[url] = revision
+            else:
+                path = resolve_page_path(html_file, url)
+                if Path(path).exists():
+                    entries[precache_url(html_file, url)] = file_md5(path)[:12]
+
+    return [{"url": url, "revision": entries[url]} for url in sorted(entries)]
+
+def build_media_revisions(catalog=None):
+    """"bucket/key" -> content hash for every image in MEDIA_BUCKET"""
+    revisions = {}
+    if catalog is not None:
+        for row in catalog.execute("SELECT remote_key, md5 FROM variants WHERE bucket = ?",
+                                   (MEDIA_BUCKET,)):
+            revisions[f"{MEDIA_BUCKET}/{row['remote_key']}"] = row["md5"][:12]
+        return dict(sorted(revisions.items()))
+
+    for dir_path, bucket_name, base_path in SYNC_SOURCES:
+        if bucket_name != MEDIA_BUCKET or not Path(dir_path).exists():
+            continue
+        for item, relative_path in list_optimized_files(dir_path):
+            revisions[f"{bucket_name}/{base_path}/{relative_path}"] = file_md5(item)[:12]
+    return dict(sorted(revisions.items()))
+
+def manifest_version(manifest):
+    """Short hash identifying this set of precached files"""
+    encoded = json.dumps(manifest, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:12]
+
+SERVICE_WORKER_TEMPLATE = """// Generated by generate_service_worker.py - do not edit by hand
+const PRECACHE_VERSION = '__VERSION__';
+const PRECACHE_MANIFEST = __MANIFEST__;
+
+// Content hash of each Storage image, so re-uploads under the same key are refetched
+const MEDIA_REVISIONS = __MEDIA_REVISIONS__;
+
+const PRECACHE = `precache-${PRECACHE_VERSION}`;
+const PAGES_CACHE = 'pages-v1';
+const MEDIA_CACHE = 'media-v2';
+const FONTS_CACHE = 'fonts-v1';
+const GALLERY_CACHE = 'gallery-v2';
+const RUNTIME_CACHES = [PAGES_CACHE, MEDIA_CACHE, FONTS_CACHE, GALLERY_CACHE];
+
+const STORAGE_PATH = '__STORAGE_PATH__';
+const MEDIA_BUCKET = '__MEDIA_BUCKET__';
+const MEDIA_MAX_ENTRIES = __MEDIA_MAX_ENTRIES__;
+const MEDIA_MAX_BYTES = __MEDIA_MAX_BYTES__;
+const GALLERY_PATTERN = new RegExp('__GALLERY_PATTERN__');
+const GALLERY_MAX_ENTRIES = __GALLERY_MAX_ENTRIES__;
+const GALLERY_MAX_BYTES = __GALLERY_MAX_BYTES__;
+const REVISION_PARAM = 'sw-rev';
+
+const precacheUrls = new Set(
+    PRECACHE_MANIFEST.map(entry => new URL(entry.url, self.location).href)
+);
+
+self.addEventListener('install', event => {
+    event.waitUntil(precacheManifest().then(() => self.skipWaiting()));
+});
+
+async function precacheManifest() {
+    const cache = await caches.open(PRECACHE);
+    // The version only covers the manifest, so a new sw.js (e.g. after an image
+    // re-upload) can find this precache already complete
+    const cached = new Set((await cache.keys()).map(request => request.url));
+
+    // URLs that only differ by ?v= share a revision; download it once
+    const urlsByRevision = new Map();
+    for (const entry of PRECACHE_MANIFEST) {
+        const url = new URL(entry.url, self.location).href;
+        if (cached.has(url)) continue;
+        if (!urlsByRevision.has(entry.revision)) urlsByRevision.set(entry.revision, []);
+        urlsByRevision.get(entry.revision).push(url);
+    }
+
+    await Promise.all([...urlsByRevision.values()].map(async urls => {
+        const response = await fetch(urls[0], { cache: 'reload', mode: 'cors', credentials: 'same-origin' });
+        if (!response.ok) {
+            throw new Error(`Precache failed for ${urls[0]}: ${response.status}`);
+        }
+        const copies = urls.map(() => response.clone());
+        await Promise.all(urls.map((url, i) => cache.put(url, copies[i])));
+    }));
+}
+
+self.addEventListener('activate', event => {
+    // Drop precaches from older manifests and runtime caches from older layouts
+    event.waitUntil(
+        caches.keys().then(keys => Promise.all(
+            keys.filter(key => key.startsWith('precache-')
+                ? key !== PRECACHE
+                : !RUNTIME_CACHES.includes(key))
+                .map(key => caches.delete(key))
+        )).then(() => self.clients.claim())
+    );
+});
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET' || request.headers.has('range')) return;
+
+    const url = new URL(request.url);
+    url.hash = '';
+
+    if (precacheUrls.has(url.href)) {
+        event.respondWith(precached(request, url.href));
+    } else if (request.mode === 'navigate') {
+        event.respondWith(staleWhileRevalidate(request, PAGES_CACHE));
+    } else if (url.pathname.includes(STORAGE_PATH + MEDIA_BUCKET + '/')) {
+        if (GALLERY_PATTERN.test(url.pathname)) {
+            event.respondWith(storageImage(request, GALLERY_CACHE, GALLERY_MAX_ENTRIES, GALLERY_MAX_BYTES));
+        } else {
+            event.respondWith(storageImage(request, MEDIA_CACHE, MEDIA_MAX_ENTRIES, MEDIA_MAX_BYTES));
+        }
+    } else if (url.hostname === 'fonts.gstatic.com') {
+        // Font files are CORS requests with versioned, immutable URLs
+        event.respondWith(cacheFirst(request, FONTS_CACHE));
+    }
+});
+
+async function precached(request, key) {
+    const cached = await caches.match(key, { cacheName: PRECACHE });
+    return cached || fetch(request);
+}
+
+function fetchForCache(request, options = {}) {
+    // Cross-origin images are requested as no-cors; refetch with CORS so the
+    // cached response isn't opaque and its size can be read
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin && request.mode === 'no-cors') {
+        return fetch(request.url, { ...options, mode: 'cors', credentials: 'omit' });
+    }
+    return fetch(request, options);
+}
+
+async function cacheFirst(request, cacheName) {
+    const cache = await caches.open(cacheName);
+    const cached = await cache.match(request.url);
+    if (cached) return cached;
+
+    const response = await fetch(request);
+    if (response.ok) {
+        await cache.put(request.url, response.clone());
+    }
+    return response;
+}
+
+async function staleWhileRevalidate(request, cacheName, onCached) {
+    const cache = await caches.open(cacheName);
+    const cached = await cache.match(request.url);
+    const network = fetchForCache(request).then(async response => {
+        if (response.ok) {
+            await cache.put(request.url, response.clone());
+            if (onCached) await onCached(cache);
+        }
+        return response;
+    });
+
+    if (cached) {
+        network.catch(() => {});
+        return cached;
+    }
+    return network;
+}
+
+function storageKey(url) {
+    return decodeURIComponent(url.pathname.split(STORAGE_PATH)[1]);
+}
+
+function revisionedKey(url, revision) {
+    const key = new URL(url.href);
+    key.searchParams.set(REVISION_PARAM, revision);
+    return key.href;
+}
+
+async function storageImage(request, cacheName, maxEntries, maxBytes) {
+    const url = new URL(request.url);
+    url.hash = '';
+    const revision = MEDIA_REVISIONS[storageKey(url)];
+    const trim = cache => trimCache(cache, maxEntries, maxBytes);
+
+    // Images this build doesn't know about are revalidated on every use
+    if (!revision) {
+        return staleWhileRevalidate(request, cacheName, trim);
+    }
+
+    const cache = await caches.open(cacheName);
+    const key = revisionedKey(url, revision);
+    const cached = await cache.match(key);
+    if (cached) {
+        // Re-insert so cache.keys() order tracks recency
+        await cache.delete(key);
+        await cache.put(key, cached.clone());
+        return cached;
+    }
+
+    // The HTTP cache may still hold the previous upload under this URL
+    const response = await fetchForCache(request, { cache: 'no-cache' });
+    if (response.ok) {
+        await deleteOtherRevisions(cache, url);
+        await cache.put(key, response.clone());
+        await trim(cache);
+    }
+    return response;
+}
+
+async function deleteOtherRevisions(cache, url) {
+    const keys = await cache.keys();
+    await Promise.all(keys.filter(key => {
+        const cachedUrl = new URL(key.url);
+        cachedUrl.searchParams.delete(REVISION_PARAM);
+        return cachedUrl.href === url.href;
+    }).map(key => cache.delete(key)));
+}
+
+async function trimCache(cache, maxEntries, maxBytes) {
+    const keys = await cache.keys();
+    const sizes = await Promise.all(keys.map(async key => {
+        const response = await cache.match(key);
+        const length = Number(response.headers.get('content-length'));
+        return length || (await response.blob()).size;
+    }));
+
+    let total = sizes.reduce((sum, size) => sum + size, 0);
+    let count = keys.length;
+    // Oldest entries come first
+    for (let i = 0; i < keys.length && (count > maxEntries || total > maxBytes); i++) {
+        await cache.delete(keys[i]);
+        total -= sizes[i];
+        count--;
+    }
+}
+"""
+
+def render_service_worker(manifest, media_revisions):
+    """Fill in the service worker template"""
+    replacements = {
+        "__VERSION__": manifest_version(manifest),
+        "__MANIFEST__": json.dumps(manifest, indent=4),
+        "__MEDIA_REVISIONS__": json.dumps(media_revisions, indent=4),
+        "__STORAGE_PATH__": STORAGE_PATH,
+        "__MEDIA_BUCKET__": MEDIA_BUCKET,
+        "__MEDIA_MAX_ENTRIES__": str(MEDIA_MAX_ENTRIES),
+        "__MEDIA_MAX_BYTES__": str(MEDIA_MAX_BYTES),
+        "__GALLERY_PATTERN__": GALLERY_PATTERN.replace("\\", "\\\\"),
+        "__GALLERY_MAX_ENTRIES__": str(GALLERY_MAX_ENTRIES),
+        "__GALLERY_MAX_BYTES__": str(GALLERY_MAX_BYTES),
+    }
+    content = SERVICE_WORKER_TEMPLATE
+    for placeholder, value in replacements.items():
+        content = content.replace(placeholder, value)
+    return content
+
+def main():
+    print("🚀 Generating service worker...")
+
+    catalog = open_catalog() if Path(CATALOG_PATH).exists() else None
+    manifest = build_manifest(catalog)
+    content = render_service_worker(manifest, build_media_revisions(catalog))
+    if catalog is not None:
+        catalog.close()
+
+    previous = Path(SERVICE_WORKER_PATH).read_text(encoding='utf-8') \
+        if Path(SERVICE_WORKER_PATH).exists() else None
+    if previous == content:
+        print(f"✅ {SERVICE_WORKER_PATH} is up to date (version {manifest_version(manifest)})")
+        return
+
+    with open(SERVICE_WORKER_PATH, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+    print(f"✅ Wrote {SERVICE_WORKER_PATH} with {len(manifest)} precached files "
+          f"(version {manifest_version(manifest)})")
+
+if __name__ == "__main__":
+    main()
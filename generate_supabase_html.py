@@ -3,10 +3,15 @@
 Generate updated HTML files with Supabase URLs and lazy loading
 """
 
+import argparse
 import os
 import re
 from pathlib import Path
 
+import generate_service_worker
+from media_catalog import (CATALOG_PATH, SYNC_SOURCES, get_variant_by_key, get_variants,
+                           open_catalog, resolve_page_path, variant_group)
+
 # Replace with your actual Supabase project URL
 # You can find this in your Supabase dashboard under Settings > API
 SUPABASE_URL = "https://rsmpxzzhelgzhkmungmd.supabase.co"
@@ -26,8 +31,42 @@ def create_supabase_url(local_path, bucket="portfolio-images"):
     
     return f"{SUPABASE_URL}/storage/v1/object/public/{bucket}/{supabase_path}"
 
-def update_image_tag(match):
-    """Update img tag to use WebP with JPEG fallback and lazy loading"""
+def get_fallback_format(source_path, catalog=None):
+    """Fallback format compress_images.sh produced: '.png' for palette images, else '.jpg'"""
+    if catalog is not None:
+        formats = {row["format"] for row in get_variants(catalog, source_path)}
+        return '.png' if 'png' in formats else '.jpg'
+    source = Path(source_path)
+    if (Path(variant_group(source)) / f"{source.stem}.png").exists():
+        return '.png'
+    return '.jpg'
+
+def variant_exists(bucket, remote_key, catalog=None):
+    """True if the optimized build contains the object for this Storage key"""
+    if catalog is not None:
+        return get_variant_by_key(catalog, bucket, remote_key) is not None
+    for dir_path, source_bucket, base_path in SYNC_SOURCES:
+        if source_bucket == bucket and remote_key.startswith(f"{base_path}/"):
+            return (Path(dir_path) / remote_key[len(base_path) + 1:]).exists()
+    return False
+
+def retarget_fallback(full_tag, supabase_url, catalog=None):
+    """Point an existing Supabase <img> at the fallback format that was actually produced"""
+    match = re.search(r'/storage/v1/object/public/(portfolio-images)/(.+)\.(jpg|png)$', supabase_url)
+    if not match:
+        return full_tag
+
+    bucket, stem, ext = match.groups()
+    # Palette images get a PNG and their JPEG is removed; everything else keeps the JPEG
+    fallback = 'png' if variant_exists(bucket, f"{stem}.png", catalog) else 'jpg'
+    if fallback == ext or not variant_exists(bucket, f"{stem}.{fallback}", catalog):
+        return full_tag
+
+    new_url = supabase_url[:-len(ext)] + fallback
+    return full_tag.replace(supabase_url, new_url)
+
+def update_image_tag(match, page_path="", catalog=None):
+    """Update img tag to use WebP with a JPEG or PNG fallback and lazy loading"""
     full_tag = match.group(0)
     src_match = re.search(r'src=["\']([^"\']+)["\']', full_tag)
     
@@ -36,14 +75,18 @@ def update_image_tag(match):
     
     original_src = src_match.group(1)
     
-    # Skip if already a Supabase URL
+    # Already on Supabase: only bring the fallback format up to date
     if "supabase.co" in original_src:
-        return full_tag
+        return retarget_fallback(full_tag, original_src, catalog)
+    
+    # Resolve "../project-images/..." from pages in projects/ to a repo path
+    source_path = resolve_page_path(page_path, original_src)
     
-    # Create WebP and JPEG URLs
-    base_name = Path(original_src).stem
-    webp_url = create_supabase_url(original_src).replace(Path(original_src).suffix, '.webp')
-    jpg_url = create_supabase_url(original_src).replace(Path(original_src).suffix, '.jpg')
+    # Create WebP and fallback URLs
+    base_name = Path(source_path).stem
+    webp_url = create_supabase_url(source_path).replace(Path(source_path).suffix, '.webp')
+    fallback_url = create_supabase_url(source_path).replace(Path(source_path).suffix,
+                                                            get_fallback_format(source_path, catalog))
     
     # Extract alt text
     alt_match = re.search(r'alt=["\']([^"\']*)["\']', full_tag)
@@ -52,7 +95,7 @@ def update_image_tag(match):
     # Create new picture element with lazy loading
     new_tag = f'''<picture>
                 <source srcset="{webp_url}" type="image/webp">
-                <img src="{jpg_url}" alt="{alt_text}" loading="lazy" class="optimized-image">
+                <img src="{fallback_url}" alt="{alt_text}" loading="lazy" class="optimized-image">
             </picture>'''
     
     return new_tag
@@ -79,7 +122,7 @@ def update_video_tag(match):
     
     return new_tag
 
-def update_html_file(file_path):
+def update_html_file(file_path, catalog=None):
     """Update HTML file to use Supabase URLs"""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
@@ -87,7 +130,8 @@ def update_html_file(file_path):
         
         # Update image tags
         img_pattern = r'<img[^>]*src=["\'][^"\']*\.(jpg|jpeg|png|JPG|JPEG|PNG)[^"\']*["\'][^>]*>'
-        content = re.sub(img_pattern, update_image_tag, content, flags=re.IGNORECASE)
+        content = re.sub(img_pattern, lambda match: update_image_tag(match, file_path, catalog),
+                         content, flags=re.IGNORECASE)
         
         # Update video tags
         video_pattern = r'<video[^>]*src=["\'][^"\']*\.(mp4|mov|MP4|MOV)[^"\']*["\'][^>]*>'
@@ -108,6 +152,25 @@ def update_html_file(file_path):
         print(f"❌ Error updating {file_path}: {e}")
         return False
 
+def retarget_html_file(file_path, catalog=None):
+    """Only update the fallback of <img> tags already on Supabase, leaving everything else as is"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    def retarget(match):
+        full_tag = match.group(0)
+        return retarget_fallback(full_tag, match.group(1), catalog)
+
+    img_pattern = r'<img[^>]*\ssrc=["\']([^"\']*/storage/v1/object/public/[^"\']+)["\'][^>]*>'
+    updated = re.sub(img_pattern, retarget, content, flags=re.IGNORECASE)
+    if updated == content:
+        return False
+
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(updated)
+    print(f"✅ Retargeted fallbacks in: {file_path}")
+    return True
+
 def add_lazy_loading_css():
     """Add CSS for lazy loading and optimized images"""
     css_content = """
@@ -138,6 +201,8 @@ def add_lazy_loading_css():
     # Add to style.css
     css_file = Path("css/style.css")
     if css_file.exists():
+        if "/* Lazy loading and optimized image styles */" in css_file.read_text(encoding='utf-8'):
+            return
         with open(css_file, 'a', encoding='utf-8') as f:
             f.write(css_content)
         print("✅ Added lazy loading CSS to style.css")
@@ -168,18 +233,19 @@ document.addEventListener('DOMContentLoaded', function() {
     # Add to script.js
     js_file = Path("js/script.js")
     if js_file.exists():
+        if "// Lazy loading for optimized images" in js_file.read_text(encoding='utf-8'):
+            return
         with open(js_file, 'a', encoding='utf-8') as f:
             f.write(js_content)
         print("✅ Added lazy loading JavaScript to script.js")
 
 def main():
-    print("🚀 Generating updated HTML files with Supabase URLs...")
-    
-    # Check if Supabase URL is set
-    if SUPABASE_URL == "https://your-project-ref.supabase.co":
-        print("❌ Please update SUPABASE_URL in this script with your actual Supabase project URL")
-        return
-    
+    parser = argparse.ArgumentParser(description="Point the HTML pages at Supabase Storage")
+    parser.add_argument("--retarget-fallbacks", action="store_true",
+                        help="only switch existing Supabase <img> fallbacks to the .jpg/.png "
+                             "variant that was produced (run by compress_images.sh)")
+    args = parser.parse_args()
+
     # HTML files to update
     html_files = [
         "index.html",
@@ -190,16 +256,43 @@ def main():
         "projects/project3.html"
     ]
     
+    # Variant lookups go through the media catalog when it has been built
+    catalog = open_catalog() if Path(CATALOG_PATH).exists() else None
+
+    if args.retarget_fallbacks:
+        print("🔁 Retargeting Supabase image fallbacks...")
+        retargeted = [html_file for html_file in html_files
+                      if Path(html_file).exists() and retarget_html_file(html_file, catalog)]
+        if catalog is not None:
+            catalog.close()
+        # Fallback URLs may be precached, so refresh the service worker too
+        generate_service_worker.main()
+        print(f"✅ Retargeted {len(retargeted)} HTML files")
+        return
+
+    print("🚀 Generating updated HTML files with Supabase URLs...")
+    
+    # Check if Supabase URL is set
+    if SUPABASE_URL == "https://your-project-ref.supabase.co":
+        print("❌ Please update SUPABASE_URL in this script with your actual Supabase project URL")
+        return
+    
     # Update HTML files
     updated_count = 0
     for html_file in html_files:
         if Path(html_file).exists():
-            if update_html_file(html_file):
+            if update_html_file(html_file, catalog):
                 updated_count += 1
     
+    if catalog is not None:
+        catalog.close()
+    
     # Add lazy loading support
     add_lazy_loading_css()
     add_lazy_loading_js()
+
+    # The pages, CSS and JS changed, so refresh the service worker's hashes
+    generate_service_worker.main()
     
     print(f"✅ Updated {updated_count} HTML files")
     print("📝 Next steps:")
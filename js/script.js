@@ -336,3 +336,14 @@ document.addEventListener('DOMContentLoaded', function() {
         }, 5000);
     }
 });
+
+// Service worker for repeat visits (sw.js is generated by generate_service_worker.py)
+if ('serviceWorker' in navigator && document.currentScript) {
+    // Resolve against this script so pages in projects/ register the same worker
+    const serviceWorkerUrl = new URL('../sw.js', document.currentScript.src);
+    window.addEventListener('load', () => {
+        navigator.serviceWorker.register(serviceWorkerUrl).catch(error => {
+            console.log('Service worker registration failed:', error);
+        });
+    });
+}
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+SQLite catalog of source media, optimized variants and page references
+
+The compression scripts rebuild it after each run. Only files whose mtime or
+size changed since the last build are re-hashed and re-probed. The uploaders
+take their file lists from it (refreshing the variants first), and
+sync_supabase.py its hashes.
+
+Usage:
+    python3 media_catalog.py build
+    python3 media_catalog.py show images/fun1.jpg
+    python3 media_catalog.py pages images/fun1.jpg
+    python3 media_catalog.py stats
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import shutil
+import sqlite3
+import subprocess
+from pathlib import Path
+
+CATALOG_PATH = "media_catalog.db"
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp'}
+VIDEO_EXTENSIONS = {'.mp4', '.mov'}
+
+# Source directories scanned for original media
+SOURCE_DIRS = ["images", "project-images", "videos"]
+
+# (local directory, bucket, remote prefix) - same layout as upload_to_supabase.py
+SYNC_SOURCES = [
+    ("optimized/images", "portfolio-images", "images"),
+    ("optimized/project-images", "portfolio-images", "project-images"),
+    ("optimized/videos", "portfolio-videos", "videos"),
+]
+
+HTML_FILES = [
+    "index.html",
+    "about.html",
+    "fun-stuff.html",
+    "projects/project1.html",
+    "projects/project2.html",
+    "projects/project3.html"
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    kind TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    md5 TEXT NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    duration REAL
+);
+CREATE TABLE IF NOT EXISTS variants (
+    id INTEGER PRIMARY KEY,
+    asset_id INTEGER REFERENCES assets(id) ON DELETE SET NULL,
+    path TEXT UNIQUE NOT NULL,
+    format TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    md5 TEXT NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    bucket TEXT NOT NULL,
+    remote_key TEXT NOT NULL,
+    UNIQUE (bucket, remote_key)
+);
+CREATE TABLE IF NOT EXISTS pages (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS page_refs (
+    page TEXT NOT NULL REFERENCES pages(path) ON DELETE CASCADE,
+    bucket TEXT,
+    ref TEXT NOT NULL,
+    PRIMARY KEY (page, bucket, ref)
+);
+CREATE INDEX IF NOT EXISTS idx_variants_asset ON variants(asset_id);
+CREATE INDEX IF NOT EXISTS idx_page_refs_ref ON page_refs(bucket, ref);
+"""
+
+def open_catalog(path=CATALOG_PATH):
+    """Open (and create if needed) the catalog database"""
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+def file_md5(file_path):
+    """MD5 of a file, matching the eTag Supabase reports"""
+    digest = hashlib.md5()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def media_kind(file_path):
+    """'image', 'video' or None for anything else"""
+    ext = Path(file_path).suffix.lower()
+    if ext in IMAGE_EXTENSIONS:
+        return "image"
+    if ext in VIDEO_EXTENSIONS:
+        return "video"
+    return None
+
+def probe_image(file_path):
+    """Width and height via ImageMagick, like compress_images.sh"""
+    if not shutil.which("identify"):
+        return None, None
+    try:
+        result = subprocess.run(["identify", "-format", "%wx%h", f"{file_path}[0]"],
+                                capture_output=True, text=True, check=True)
+        width, height = result.stdout.strip().split("x")
+        return int(width), int(height)
+    except Exception:
+        return None, None
+
+def probe_video(file_path):
+    """Width, height and duration via ffprobe, like compress_videos.sh"""
+    if not shutil.which("ffprobe"):
+        return None, None, None
+    try:
+        result = subprocess.run(["ffprobe", "-v", "quiet", "-print_format", "json",
+                                 "-select_streams", "v:0", "-show_entries",
+                                 "stream=width,height:format=duration", str(file_path)],
+                                capture_output=True, text=True, check=True)
+        info = json.loads(result.stdout)
+        stream = (info.get("streams") or [{}])[0]
+        duration = info.get("format", {}).get("duration")
+        return stream.get("width"), stream.get("height"), float(duration) if duration else None
+    except Exception:
+        return None, None, None
+
+def probe(file_path):
+    """Dimensions (and duration for videos) of a media file"""
+    if media_kind(file_path) == "video":
+        return probe_video(file_path)
+    width, height = probe_image(file_path)
+    return width, height, None
+
+def is_fresh(row, stat):
+    """True if the catalog row still describes the file on disk"""
+    return row is not None and row["mtime"] == stat.st_mtime and row["bytes"] == stat.st_size
+
+def variant_group(source_path):
+    """The optimized/ directory a source file's variants land in"""
+    if media_kind(source_path) == "video":
+        return "optimized/videos"
+    if source_path.parts[0] == "project-images":
+        return "optimized/project-images"
+    return "optimized/images"
+
+def index_assets(conn):
+    """Add or refresh source media, returns (scanned, refreshed)"""
+    seen = set()
+    refreshed = 0
+
+    for source_dir in SOURCE_DIRS:
+        for item in sorted(Path(source_dir).rglob("*")):
+            if not item.is_file() or item.name.startswith(".") or not media_kind(item):
+                continue
+            path = item.as_posix()
+            seen.add(path)
+            stat = item.stat()
+            row = conn.execute("SELECT mtime, bytes FROM assets WHERE path = ?", (path,)).fetchone()
+            if is_fresh(row, stat):
+                continue
+
+            width, height, duration = probe(item)
+            conn.execute("""
+                INSERT INTO assets (path, kind, bytes, mtime, md5, width, height, duration)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                    kind = excluded.kind, bytes = excluded.bytes, mtime = excluded.mtime,
+                    md5 = excluded.md5, width = excluded.width, height = excluded.height,
+                    duration = excluded.duration
+            """, (path, media_kind(item), stat.st_size, stat.st_mtime, file_md5(item),
+                  width, height, duration))
+            refreshed += 1
+
+    for row in conn.execute("SELECT path FROM assets").fetchall():
+        if row["path"] not in seen:
+            conn.execute("DELETE FROM assets WHERE path = ?", (row["path"],))
+
+    return len(seen), refreshed
+
+def index_variants(conn):
+    """Add or refresh optimized files, returns (scanned, refreshed)"""
+    # (group, stem) -> asset id, so variants can be linked back to their source
+    sources = {}
+    for row in conn.execute("SELECT id, path FROM assets"):
+        source_path = Path(row["path"])
+        sources[(variant_group(source_path), source_path.stem.lower())] = row["id"]
+
+    seen = set()
+    refreshed = 0
+
+    for dir_path, bucket_name, base_path in SYNC_SOURCES:
+        for item in sorted(Path(dir_path).rglob("*")):
+            if not item.is_file() or item.name.startswith(".") or not media_kind(item):
+                continue
+            path = item.as_posix()
+            seen.add(path)
+            asset_id = sources.get((dir_path, item.stem.lower()))
+            stat = item.stat()
+            row = conn.execute("SELECT mtime, bytes FROM variants WHERE path = ?", (path,)).fetchone()
+            if is_fresh(row, stat):
+                # Sources may have appeared or moved since the variant was indexed
+                conn.execute("UPDATE variants SET asset_id = ? WHERE path = ?", (asset_id, path))
+                continue
+
+            width, height, _ = probe(item)
+            remote_key = f"{base_path}/{item.relative_to(dir_path).as_posix()}"
+            conn.execute("""
+                INSERT INTO variants (asset_id, path, format, bytes, mtime, md5, width, height,
+                                      bucket, remote_key)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                    asset_id = excluded.asset_id, format = excluded.format,
+                    bytes = excluded.bytes, mtime = excluded.mtime, md5 = excluded.md5,
+                    width = excluded.width, height = excluded.height,
+                    bucket = excluded.bucket, remote_key = excluded.remote_key
+            """, (asset_id, path, item.suffix.lower().lstrip("."), stat.st_size, stat.st_mtime,
+                  file_md5(item), width, height, bucket_name, remote_key))
+            refreshed += 1
+
+    for row in conn.execute("SELECT path FROM variants").fetchall():
+        if row["path"] not in seen:
+            conn.execute("DELETE FROM variants WHERE path = ?", (row["path"],))
+
+    return len(seen), refreshed
+
+def resolve_page_path(page_path, url):
+    """Repo path of a URL relative to a page, e.g. "../images/x.jpg" -> "images/x.jpg"
+
+    Query strings and fragments are dropped.
+    """
+    url = url.split("?")[0].split("#")[0]
+    parts = []
+    for part in (Path(page_path).parent / url).as_posix().split("/"):
+        if part == "..":
+            if parts:
+                parts.pop()
+        elif part not in ("", "."):
+            parts.append(part)
+    return "/".join(parts)
+
+def find_page_refs(page_path, content):
+    """(bucket, ref) pairs for every media URL in a page
+
+    Supabase URLs give (bucket, key); relative paths give (None, repo path).
+    """
+    refs = set()
+    for bucket_name, key in re.findall(
+            r'/storage/v1/object/public/([^/"\']+)/([^"\'\s)?]+)', content):
+        refs.add((bucket_name, key))
+
+    for url in re.findall(r'(?:src|srcset|href)=["\']([^"\':?#]+)["\']', content):
+        if media_kind(url):
+            refs.add((None, resolve_page_path(page_path, url)))
+
+    return refs
+
+def index_pages(conn):
+    """Re-parse HTML pages that changed, returns (scanned, refreshed)"""
+    refreshed = 0
+    seen = set()
+
+    for html_file in HTML_FILES:
+        page = Path(html_file)
+        if not page.exists():
+            continue
+        seen.add(html_file)
+        mtime = page.stat().st_mtime
+        row = conn.execute("SELECT mtime FROM pages WHERE path = ?", (html_file,)).fetchone()
+        if row is not None and row["mtime"] == mtime:
+            continue
+
+        with open(page, 'r', encoding='utf-8') as f:
+            refs = find_page_refs(html_file, f.read())
+
+        conn.execute("INSERT OR REPLACE INTO pages (path, mtime) VALUES (?, ?)", (html_file, mtime))
+        conn.execute("DELETE FROM page_refs WHERE page = ?", (html_file,))
+        conn.executemany("INSERT INTO page_refs (page, bucket, ref) VALUES (?, ?, ?)",
+                         [(html_file, bucket_name, ref) for bucket_name, ref in refs])
+        refreshed += 1
+
+    for row in conn.execute("SELECT path FROM pages").fetchall():
+        if row["path"] not in seen:
+            conn.execute("DELETE FROM pages WHERE path = ?", (row["path"],))
+
+    return len(seen), refreshed
+
+def build_catalog(conn):
+    """Bring the catalog up to date with the working tree"""
+    with conn:
+        results = {
+            "assets": index_assets(conn),
+            "variants": index_variants(conn),
+            "pages": index_pages(conn),
+        }
+    return results
+
+def get_asset(conn, path):
+    """Catalog row for a source file"""
+    return conn.execute("SELECT * FROM assets WHERE path = ?", (path,)).fetchone()
+
+def get_variants(conn, source_path):
+    """Optimized variants produced from a source file"""
+    return conn.execute("""
+        SELECT v.* FROM variants v JOIN assets a ON a.id = v.asset_id
+        WHERE a.path = ? ORDER BY v.format
+    """, (source_path,)).fetchall()
+
+def get_variant_by_path(conn, path):
+    """Catalog row for a file under optimized/"""
+    return conn.execute("SELECT * FROM variants WHERE path = ?", (path,)).fetchone()
+
+def get_variant_by_key(conn, bucket_name, remote_key):
+    """Catalog row for a remote object"""
+    return conn.execute("SELECT * FROM variants WHERE bucket = ? AND remote_key = ?",
+                        (bucket_name, remote_key)).fetchone()
+
+def list_optimized_files(dir_path, catalog_path=CATALOG_PATH):
+    """(path, path relative to dir_path) for every media file under an optimized/ directory
+
+    Read from the catalog when one exists, after an incremental refresh of
+    the variants so files added or removed since the last build are picked
+    up (only new or changed files get hashed). Falls back to a directory walk
+    without a catalog.
+    """
+    dir_path = Path(dir_path)
+    if Path(catalog_path).exists():
+        conn = open_catalog(catalog_path)
+        try:
+            with conn:
+                index_variants(conn)
+            prefix = f"{dir_path.as_posix()}/"
+            rows = conn.execute("SELECT path FROM variants WHERE substr(path, 1, ?) = ? ORDER BY path",
+                                (len(prefix), prefix)).fetchall()
+        finally:
+            conn.close()
+        paths = [Path(row["path"]) for row in rows]
+    else:
+        paths = [item for item in sorted(dir_path.rglob("*"))
+                 if item.is_file() and not item.name.startswith(".") and media_kind(item)]
+    return [(path, path.relative_to(dir_path).as_posix()) for path in paths]
+
+def get_referencing_pages(conn, path):
+    """Pages that use a source file, any of its variants, or a variant directly"""
+    return [row["page"] for row in conn.execute("""
+        SELECT DISTINCT r.page FROM page_refs r
+        WHERE (r.bucket IS NULL AND r.ref = :path)
+           OR EXISTS (
+               SELECT 1 FROM variants v LEFT JOIN assets a ON a.id = v.asset_id
+               WHERE (a.path = :path OR v.path = :path)
+                 AND ((r.bucket = v.bucket AND r.ref = v.remote_key)
+                      OR (r.bucket IS NULL AND r.ref = v.path))
+           )
+        ORDER BY r.page
+    """, {"path": path})]
+
+def format_size(num_bytes):
+    """Human readable size"""
+    for unit in ["B", "KB", "MB", "GB"]:
+        if num_bytes < 1024 or unit == "GB":
+            return f"{num_bytes:.1f}{unit}" if unit != "B" else f"{num_bytes}B"
+        num_bytes /= 1024
+
+def show_asset(conn, path):
+    """Print everything the catalog knows about a file"""
+    asset = get_asset(conn, path)
+    if asset is None:
+        variant = get_variant_by_path(conn, path)
+        if variant is None:
+            print(f"❌ Not in catalog: {path}")
+            return
+        print(f"🖼️  {variant['path']} ({variant['format']}, {format_size(variant['bytes'])})")
+        print(f"  Remote: {variant['bucket']}/{variant['remote_key']}")
+    else:
+        size = f"{asset['width']}x{asset['height']}" if asset["width"] else "unknown size"
+        duration = f", {asset['duration']:.1f}s" if asset["duration"] else ""
+        print(f"🖼️  {asset['path']} ({asset['kind']}, {size}{duration}, {format_size(asset['bytes'])})")
+        print(f"  MD5: {asset['md5']}")
+        for variant in get_variants(conn, path):
+            width = f"{variant['width']}w" if variant["width"] else "?w"
+            print(f"  ↳ {variant['format']:<5} {width:>6} {format_size(variant['bytes']):>9}  "
+                  f"{variant['bucket']}/{variant['remote_key']}")
+
+    pages = get_referencing_pages(conn, path)
+    print(f"  Pages: {', '.join(pages) if pages else 'none'}")
+
+def show_stats(conn):
+    """Print catalog totals"""
+    for kind, count, total in conn.execute(
+            "SELECT kind, COUNT(*), COALESCE(SUM(bytes), 0) FROM assets GROUP BY kind"):
+        print(f"📁 Source {kind}s: {count} ({format_size(total)})")
+    for fmt, count, total in conn.execute(
+            "SELECT format, COUNT(*), COALESCE(SUM(bytes), 0) FROM variants GROUP BY format"):
+        print(f"📦 Optimized {fmt}: {count} ({format_size(total)})")
+    orphans = conn.execute("SELECT COUNT(*) FROM variants WHERE asset_id IS NULL").fetchone()[0]
+    refs = conn.execute("SELECT COUNT(*) FROM page_refs").fetchone()[0]
+    print(f"🔗 Page references: {refs}")
+    print(f"⚠️  Variants without a source: {orphans}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the portfolio media catalog")
+    parser.add_argument("--db", default=CATALOG_PATH, help="catalog database path")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("build", help="index new and changed files")
+    show_parser = commands.add_parser("show", help="details, variants and pages for a file")
+    show_parser.add_argument("path")
+    pages_parser = commands.add_parser("pages", help="pages referencing a file")
+    pages_parser.add_argument("path")
+    commands.add_parser("stats", help="catalog totals")
+    args = parser.parse_args()
+
+    conn = open_catalog(args.db)
+
+    if args.command == "build":
+        print("🗂️  Updating media catalog...")
+        for table, (scanned, refreshed) in build_catalog(conn).items():
+            print(f"  {table}: {scanned} scanned, {refreshed} updated")
+        print(f"✅ Catalog saved to {args.db}")
+    elif args.command == "show":
+        show_asset(conn, args.path)
+    elif args.command == "pages":
+        for page in get_referencing_pages(conn, args.path):
+            print(page)
+    elif args.command == "stats":
+        show_stats(conn)
+
+    conn.close()
+
+if __name__ == "__main__":
+    main()
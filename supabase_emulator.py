@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Supabase Storage object endpoints
+
+Implements the calls the upload and sync scripts make:
+    POST/PUT /storage/v1/object/{bucket}/{key}     upload (x-upsert to overwrite)
+    GET      /storage/v1/object/public/{bucket}/{key}
+    POST     /storage/v1/object/list/{bucket}      list one folder level
+    DELETE   /storage/v1/object/{bucket}           delete {"prefixes": [...]}
+
+Latency, bandwidth, error rate and concurrency can be injected to benchmark
+the uploaders. Point them at it with:
+    SUPABASE_URL=http://127.0.0.1:54321 python3 upload_to_supabase.py
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse
+
+OBJECT_PREFIX = "/storage/v1/object/"
+CHUNK_SIZE = 64 * 1024
+
+class StorageEmulator:
+    """In-memory buckets plus the network conditions to simulate"""
+
+    def __init__(self, latency_ms=0, jitter_ms=0, bandwidth_kbps=0, error_rate=0.0,
+                 max_concurrency=0, seed=None, total_bandwidth_kbps=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        # bandwidth_kbps caps each connection, total_bandwidth_kbps all of them together
+        self.bandwidth_kbps = bandwidth_kbps
+        self.total_bandwidth_kbps = total_bandwidth_kbps
+        self.link_free_at = 0.0
+        self.error_rate = error_rate
+        # Requests beyond the limit wait for a free slot, like a saturated backend
+        self.slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self.random = random.Random(seed)
+        self.objects = {}
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "injected_errors": 0, "bytes_in": 0, "bytes_out": 0}
+
+    def reset(self):
+        """Drop all objects and counters"""
+        with self.lock:
+            self.objects.clear()
+            self.link_free_at = 0.0
+            for name in self.stats:
+                self.stats[name] = 0
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.stats[name] += amount
+
+    def delay(self):
+        """Sleep for the configured per-request latency"""
+        with self.lock:
+            jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+        latency = max(0, self.latency_ms + jitter)
+        if latency:
+            time.sleep(latency / 1000)
+
+    def should_fail(self):
+        """Roll for an injected server error"""
+        if not self.error_rate:
+            return False
+        with self.lock:
+            return self.random.random() < self.error_rate
+
+    def throttle(self, num_bytes):
+        """Sleep long enough to respect the per-connection and total bandwidth caps"""
+        if not num_bytes:
+            return
+        wait = num_bytes * 8 / (self.bandwidth_kbps * 1000) if self.bandwidth_kbps else 0
+        if self.total_bandwidth_kbps:
+            # One shared link: each chunk books the next free slice of it
+            with self.lock:
+                now = time.monotonic()
+                start = max(now, self.link_free_at)
+                self.link_free_at = start + num_bytes * 8 / (self.total_bandwidth_kbps * 1000)
+                wait = max(wait, self.link_free_at - now)
+        if wait:
+            time.sleep(wait)
+
+    def put(self, bucket_name, key, data, content_type, upsert):
+        """Store an object, returns False if it exists and upsert is off"""
+        now = datetime.now(timezone.utc).isoformat()
+        with self.lock:
+            existing = self.objects.get((bucket_name, key))
+            if existing is not None and not upsert:
+                return False
+            self.objects[(bucket_name, key)] = {
+                "data": data,
+                "content_type": content_type,
+                "md5": hashlib.md5(data).hexdigest(),
+                "created_at": existing["created_at"] if existing else now,
+                "updated_at": now
+            }
+            return True
+
+    def get(self, bucket_name, key):
+        with self.lock:
+            return self.objects.get((bucket_name, key))
+
+    def list(self, bucket_name, prefix, limit, offset):
+        """One folder level, in the shape the Storage list API returns"""
+        folder = f"{prefix.strip('/')}/" if prefix.strip("/") else ""
+        entries = {}
+        with self.lock:
+            for (obj_bucket, key), obj in self.objects.items():
+                if obj_bucket != bucket_name or not key.startswith(folder):
+                    continue
+                name, _, rest = key[len(folder):].partition("/")
+                if rest:
+                    entries[name] = {"name": name, "id": None, "metadata": None}
+                else:
+                    entries[name] = {
+                        "name": name,
+                        "id": hashlib.md5(f"{bucket_name}/{key}".encode()).hexdigest(),
+                        "created_at": obj["created_at"],
+                        "updated_at": obj["updated_at"],
+                        "metadata": {
+                            "size": len(obj["data"]),
+                            "mimetype": obj["content_type"],
+                            "eTag": f'"{obj["md5"]}"'
+                        }
+                    }
+        names = sorted(entries)[offset:offset + limit]
+        return [entries[name] for name in names]
+
+    def delete(self, bucket_name, keys):
+        """Remove objects, returns the ones that existed"""
+        removed = []
+        with self.lock:
+            for key in keys:
+                if self.objects.pop((bucket_name, key), None) is not None:
+                    removed.append({"name": key, "bucket_id": bucket_name})
+        return removed
+
+def make_handler(emulator):
+    """Request handler class bound to one emulator"""
+
+    class StorageHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def read_body(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            chunks = []
+            remaining = length
+            while remaining:
+                chunk = self.rfile.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                remaining -= len(chunk)
+                emulator.throttle(len(chunk))
+            emulator.count("bytes_in", length)
+            return b"".join(chunks)
+
+        def send_body(self, status, body, content_type="application/json", headers=None):
+            if not isinstance(body, bytes):
+                body = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Access-Control-Allow-Origin", "*")
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            for i in range(0, len(body), CHUNK_SIZE):
+                chunk = body[i:i + CHUNK_SIZE]
+                self.wfile.write(chunk)
+                emulator.throttle(len(chunk))
+            emulator.count("bytes_out", len(body))
+
+        def send_error_body(self, status, error, message):
+            self.send_body(status, {"statusCode": str(status), "error": error, "message": message})
+
+        def route(self):
+            """(action, bucket, key) for the request path"""
+            path = unquote(urlparse(self.path).path)
+            if not path.startswith(OBJECT_PREFIX):
+                return None, None, None
+            rest = path[len(OBJECT_PREFIX):]
+            for action in ("public", "list"):
+                if rest.startswith(f"{action}/"):
+                    bucket_name, _, key = rest[len(action) + 1:].partition("/")
+                    return action, bucket_name, key
+            bucket_name, _, key = rest.partition("/")
+            return "object", bucket_name, key
+
+        def handle_request(self, method):
+            emulator.count("requests")
+
+            # Take a slot before reading the body so uploads in flight are limited too
+            if emulator.slots:
+                emulator.slots.acquire()
+            try:
+                body = self.read_body() if method in ("POST", "PUT", "DELETE") else b""
+                emulator.delay()
+                if emulator.should_fail():
+                    emulator.count("injected_errors")
+                    self.send_error_body(503, "Service Unavailable", "Injected failure")
+                    return
+                self.dispatch(method, body)
+            finally:
+                if emulator.slots:
+                    emulator.slots.release()
+
+        def dispatch(self, method, body):
+            action, bucket_name, key = self.route()
+
+            if action == "public" and method == "GET" and key:
+                obj = emulator.get(bucket_name, key)
+                if obj is None:
+                    self.send_error_body(404, "not_found", "Object not found")
+                else:
+                    self.send_body(200, obj["data"], obj["content_type"],
+                                   {"ETag": f'"{obj["md5"]}"'})
+            elif action == "list" and method == "POST":
+                options = json.loads(body or b"{}")
+                self.send_body(200, emulator.list(bucket_name, options.get("prefix", ""),
+                                                  options.get("limit", 100),
+                                                  options.get("offset", 0)))
+            elif action == "object" and method in ("POST", "PUT") and key:
+                content_type = self.headers.get("Content-Type") or "application/octet-stream"
+                upsert = method == "PUT" or self.headers.get("x-upsert", "").lower() == "true"
+                if emulator.put(bucket_name, key, body, content_type, upsert):
+                    self.send_body(200, {"Key": f"{bucket_name}/{key}"})
+                else:
+                    # Supabase reports duplicates as a 400 with a 409 statusCode
+                    self.send_body(400, {"statusCode": "409", "error": "Duplicate",
+                                         "message": "The resource already exists"})
+            elif action == "object" and method == "DELETE" and not key:
+                options = json.loads(body or b"{}")
+                self.send_body(200, emulator.delete(bucket_name, options.get("prefixes", [])))
+            else:
+                self.send_error_body(404, "not_found", f"No route for {method} {self.path}")
+
+        def do_GET(self):
+            self.handle_request("GET")
+
+        def do_POST(self):
+            self.handle_request("POST")
+
+        def do_PUT(self):
+            self.handle_request("PUT")
+
+        def do_DELETE(self):
+            self.handle_request("DELETE")
+
+    return StorageHandler
+
+def start_emulator(emulator, host="127.0.0.1", port=0):
+    """Serve the emulator on a background thread, returns (server, base_url)"""
+    server = ThreadingHTTPServer((host, port), make_handler(emulator))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Supabase Storage emulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--latency-ms", type=float, default=0, help="added to every request")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="random +/- on the latency")
+    parser.add_argument("--bandwidth-kbps", type=float, default=0,
+                        help="per-connection cap, 0 for none")
+    parser.add_argument("--total-bandwidth-kbps", type=float, default=0,
+                        help="cap shared by all connections, 0 for none")
+    parser.add_argument("--error-rate", type=float, default=0, help="fraction of requests that get a 503")
+    parser.add_argument("--max-concurrency", type=int, default=0,
+                        help="requests served at once (including body transfer), 0 for no limit")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    emulator = StorageEmulator(args.latency_ms, args.jitter_ms, args.bandwidth_kbps,
+                               args.error_rate, args.max_concurrency, args.seed,
+                               total_bandwidth_kbps=args.total_bandwidth_kbps)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(emulator))
+    server.daemon_threads = True
+
+    print(f"🧪 Supabase Storage emulator on http://{args.host}:{args.port}")
+    print(f"   Run uploaders with SUPABASE_URL=http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,509 @@
+// Generated by generate_service_worker.py - do not edit by hand
+const PRECACHE_VERSION = '31accf57bece';
+const PRECACHE_MANIFEST = [
+    {
+        "url": "css/style.css?v=1.6",
+        "revision": "8a073c1fe1b6"
+    },
+    {
+        "url": "css/style.css?v=1.7",
+        "revision": "8a073c1fe1b6"
+    },
+    {
+        "url": "css/style.css?v=4.7",
+        "revision": "8a073c1fe1b6"
+    },
+    {
+        "url": "css/style.css?v=5.3",
+        "revision": "8a073c1fe1b6"
+    },
+    {
+        "url": "css/style.css?v=5.4",
+        "revision": "8a073c1fe1b6"
+    },
+    {
+        "url": "css/style.css?v=6.2",
+        "revision": "8a073c1fe1b6"
+    },
+    {
+        "url": "https://rsmpxzzhelgzhkmungmd.supabase.co/storage/v1/object/public/portfolio-images/images/about-me-1.webp",
+        "revision": "0de85da67775"
+    },
+    {
+        "url": "https://rsmpxzzhelgzhkmungmd.supabase.co/storage/v1/object/public/portfolio-images/images/about-me-2.webp",
+        "revision": "34c11beca306"
+    },
+    {
+        "url": "https://rsmpxzzhelgzhkmungmd.supabase.co/storage/v1/object/public/portfolio-images/images/bella-photo.jpg",
+        "revision": "df2ef3cfc591"
+    },
+    {
+        "url": "https://rsmpxzzhelgzhkmungmd.supabase.co/storage/v1/object/public/portfolio-images/images/fun35.webp",
+        "revision": "4c7f72c13763"
+    },
+    {
+        "url": "https://rsmpxzzhelgzhkmungmd.supabase.co/storage/v1/object/public/portfolio-images/images/fun36.webp",
+        "revision": "2bd47b1bb024"
+    },
+    {
+        "url": "https://rsmpxzzhelgzhkmungmd.supabase.co/storage/v1/object/public/portfolio-images/images/hands-photo.jpg",
+        "revision": "d6a2c1f8c63e"
+    },
+    {
+        "url": "https://rsmpxzzhelgzhkmungmd.supabase.co/storage/v1/object/public/portfolio-images/images/project2.jpg",
+        "revision": "b14a325906d8"
+    },
+    {
+        "url": "https://rsmpxzzhelgzhkmungmd.supabase.co/storage/v1/object/public/portfolio-images/images/tech-spec.webp",
+        "revision": "a7ad490e1957"
+    },
+    {
+        "url": "https://rsmpxzzhelgzhkmungmd.supabase.co/storage/v1/object/public/portfolio-images/images/why-piano.jpg",
+        "revision": "a0d63d220791"
+    },
+    {
+        "url": "https://rsmpxzzhelgzhkmungmd.supabase.co/storage/v1/object/public/portfolio-images/project-images/initial-research.jpg",
+        "revision": "9e2887bda0b6"
+    },
+    {
+        "url": "https://rsmpxzzhelgzhkmungmd.supabase.co/storage/v1/object/public/portfolio-images/project-images/proj3-overview2.jpg",
+        "revision": "95448990b34d"
+    },
+    {
+        "url": "js/gallery.js?v=1.3",
+        "revision": "0c14fc15b2cb"
+    },
+    {
+        "url": "js/script.js?v=2.7",
+        "revision": "6778d8d37972"
+    },
+    {
+        "url": "js/script.js?v=2.9",
+        "revision": "6778d8d37972"
+    },
+    {
+        "url": "js/script.js?v=3.0",
+        "revision": "6778d8d37972"
+    },
+    {
+        "url": "js/script.js?v=3.1",
+        "revision": "6778d8d37972"
+    },
+    {
+        "url": "project-images/project3/main.jpg",
+        "revision": "e401e0b092e3"
+    }
+];
+
+// Content hash of each Storage image, so re-uploads under the same key are refetched
+const MEDIA_REVISIONS = {
+    "portfolio-images/images/about-me-1.jpg": "7f221a5e8306",
+    "portfolio-images/images/about-me-1.webp": "0de85da67775",
+    "portfolio-images/images/about-me-2.jpg": "5c1db1b8c8f2",
+    "portfolio-images/images/about-me-2.webp": "34c11beca306",
+    "portfolio-images/images/about-me-3.jpg": "b8e256b482a6",
+    "portfolio-images/images/about-me-3.webp": "84d18623400b",
+    "portfolio-images/images/about-me-4.jpg": "918678023adb",
+    "portfolio-images/images/about-me-4.webp": "7f69be612dc5",
+    "portfolio-images/images/bella-photo.jpg": "df2ef3cfc591",
+    "portfolio-images/images/bella-photo.webp": "cec8176816ce",
+    "portfolio-images/images/challenges.jpg": "4aaa069b1637",
+    "portfolio-images/images/challenges.webp": "f19d0e4897c9",
+    "portfolio-images/images/dvorak-keyboard.jpg": "e635f81b9cd1",
+    "portfolio-images/images/dvorak-keyboard.webp": "e2809db68191",
+    "portfolio-images/images/final-layout.jpg": "87a646f6430f",
+    "portfolio-images/images/final-layout.webp": "bf080417475b",
+    "portfolio-images/images/fun1.jpg": "52e3d73759c3",
+    "portfolio-images/images/fun1.webp": "860488c9ba77",
+    "portfolio-images/images/fun10.jpg": "4e14ed68a75b",
+    "portfolio-images/images/fun10.webp": "e54ab0dd1183",
+    "portfolio-images/images/fun11.jpg": "84ab27a4db45",
+    "portfolio-images/images/fun11.webp": "3ede9e18c88b",
+    "portfolio-images/images/fun12.jpg": "4f98ac1ce7e1",
+    "portfolio-images/images/fun12.webp": "0d31cea3c9fd",
+    "portfolio-images/images/fun13.jpg": "be1bcb6010f9",
+    "portfolio-images/images/fun13.webp": "0ad07ebebde0",
+    "portfolio-images/images/fun14.jpg": "006a8fc037b2",
+    "portfolio-images/images/fun14.webp": "bb6902946208",
+    "portfolio-images/images/fun15.jpg": "aea29dfa7eab",
+    "portfolio-images/images/fun15.webp": "914e461209d5",
+    "portfolio-images/images/fun16.jpg": "5834da9b089c",
+    "portfolio-images/images/fun16.webp": "21ddb2a29692",
+    "portfolio-images/images/fun17.jpg": "f54d5a6619fb",
+    "portfolio-images/images/fun17.webp": "64be6a4f7133",
+    "portfolio-images/images/fun18.jpg": "50cca2e66d01",
+    "portfolio-images/images/fun18.webp": "a767acdedf73",
+    "portfolio-images/images/fun19.jpg": "b6a49f65e732",
+    "portfolio-images/images/fun19.webp": "0666f51ff178",
+    "portfolio-images/images/fun2.jpg": "916958badc94",
+    "portfolio-images/images/fun2.webp": "701737254708",
+    "portfolio-images/images/fun20.jpg": "849bb945c5c2",
+    "portfolio-images/images/fun20.webp": "24a7ad44dd2e",
+    "portfolio-images/images/fun21.jpg": "ad8ab2fd0da7",
+    "portfolio-images/images/fun21.webp": "e7be75ae76c0",
+    "portfolio-images/images/fun22.jpg": "1b0f83dddbb5",
+    "portfolio-images/images/fun22.webp": "e4ed831b022b",
+    "portfolio-images/images/fun26.jpg": "b8b05030027b",
+    "portfolio-images/images/fun26.webp": "47bbfc58928d",
+    "portfolio-images/images/fun27.jpg": "732e13667f8a",
+    "portfolio-images/images/fun27.webp": "25cf9c0e0b52",
+    "portfolio-images/images/fun28.jpg": "ffaca7be0023",
+    "portfolio-images/images/fun28.webp": "d3fc087f3ebe",
+    "portfolio-images/images/fun29.jpg": "6f8daa28394a",
+    "portfolio-images/images/fun29.webp": "dc2c0873f880",
+    "portfolio-images/images/fun3.jpg": "c6c9ffd41cb5",
+    "portfolio-images/images/fun3.webp": "e58e350c31a9",
+    "portfolio-images/images/fun30.jpg": "1fe2da4480d7",
+    "portfolio-images/images/fun30.webp": "d9664a4cf6ef",
+    "portfolio-images/images/fun31.jpg": "d82b30515d29",
+    "portfolio-images/images/fun31.webp": "61e7870b808f",
+    "portfolio-images/images/fun32.jpg": "1d5d6acae220",
+    "portfolio-images/images/fun32.webp": "cc3fbb462511",
+    "portfolio-images/images/fun33.jpg": "b5a485c6b2ac",
+    "portfolio-images/images/fun33.webp": "e6f8815d0670",
+    "portfolio-images/images/fun34.jpg": "ae4cd79e6032",
+    "portfolio-images/images/fun34.webp": "15f0add5f9ac",
+    "portfolio-images/images/fun35.jpg": "8c5817a96e89",
+    "portfolio-images/images/fun35.webp": "4c7f72c13763",
+    "portfolio-images/images/fun36.jpg": "3820291bd5d9",
+    "portfolio-images/images/fun36.webp": "2bd47b1bb024",
+    "portfolio-images/images/fun37.jpg": "805a494d5418",
+    "portfolio-images/images/fun37.webp": "9c08ff25d238",
+    "portfolio-images/images/fun38.jpg": "bdf498f80301",
+    "portfolio-images/images/fun38.webp": "5c8df1b4d1a3",
+    "portfolio-images/images/fun39.jpg": "d4b1edbcfdca",
+    "portfolio-images/images/fun39.webp": "fab38d864038",
+    "portfolio-images/images/fun4.jpg": "9d5dee76707b",
+    "portfolio-images/images/fun4.webp": "ff4132980768",
+    "portfolio-images/images/fun40.jpg": "6fd58914e612",
+    "portfolio-images/images/fun40.webp": "a6ef99493f33",
+    "portfolio-images/images/fun41.jpg": "ddccb59d424b",
+    "portfolio-images/images/fun41.webp": "40174152a42e",
+    "portfolio-images/images/fun42.jpg": "2962cb52d126",
+    "portfolio-images/images/fun42.webp": "b884e4c5c254",
+    "portfolio-images/images/fun43.jpg": "2b772623358d",
+    "portfolio-images/images/fun43.webp": "5900e9bc2ae2",
+    "portfolio-images/images/fun44.jpg": "718a5edfdef9",
+    "portfolio-images/images/fun44.webp": "2c5070633a41",
+    "portfolio-images/images/fun45.jpg": "4cd52c43df48",
+    "portfolio-images/images/fun45.webp": "87c5ae8a7657",
+    "portfolio-images/images/fun46.jpg": "b1d05d7b451b",
+    "portfolio-images/images/fun46.webp": "621465310779",
+    "portfolio-images/images/fun47.jpg": "a447111653f4",
+    "portfolio-images/images/fun47.webp": "e0991d9f777a",
+    "portfolio-images/images/fun48.jpg": "82c47839d284",
+    "portfolio-images/images/fun48.webp": "a74f895ee064",
+    "portfolio-images/images/fun49.jpg": "5ba1d9ca51f4",
+    "portfolio-images/images/fun49.webp": "c35419b01191",
+    "portfolio-images/images/fun5.jpg": "e3099375a4ee",
+    "portfolio-images/images/fun5.webp": "2625cdc0b95d",
+    "portfolio-images/images/fun50.jpg": "5d3a3b6525a3",
+    "portfolio-images/images/fun50.webp": "7d657d512ee0",
+    "portfolio-images/images/fun51.jpg": "25656f071cb9",
+    "portfolio-images/images/fun51.webp": "ccd53d3d1371",
+    "portfolio-images/images/fun52.jpg": "16f6e3510022",
+    "portfolio-images/images/fun52.webp": "c4dc8c797099",
+    "portfolio-images/images/fun53.jpg": "3677ac51ff8a",
+    "portfolio-images/images/fun53.webp": "312c9c51eeca",
+    "portfolio-images/images/fun54.jpg": "161d2a873595",
+    "portfolio-images/images/fun54.webp": "1404c4df9985",
+    "portfolio-images/images/fun55.jpg": "12dbdfd63099",
+    "portfolio-images/images/fun55.webp": "533c826a765c",
+    "portfolio-images/images/fun56.jpg": "03a2ee553de3",
+    "portfolio-images/images/fun56.webp": "2bae2dc30d71",
+    "portfolio-images/images/fun57.jpg": "a4290bb73f9d",
+    "portfolio-images/images/fun57.webp": "198756f68a26",
+    "portfolio-images/images/fun58.jpg": "7deb799c852b",
+    "portfolio-images/images/fun58.webp": "cea4fa3afd00",
+    "portfolio-images/images/fun59.jpg": "52592ab846a5",
+    "portfolio-images/images/fun59.webp": "2ee566434ced",
+    "portfolio-images/images/fun6.jpg": "f620d9e0e4bf",
+    "portfolio-images/images/fun6.webp": "0d3065bbb239",
+    "portfolio-images/images/fun60.jpg": "f2f815b25b4b",
+    "portfolio-images/images/fun60.webp": "8d1285b0fb82",
+    "portfolio-images/images/fun61.jpg": "e7a2742df07e",
+    "portfolio-images/images/fun61.webp": "af8285e1022d",
+    "portfolio-images/images/fun62.jpg": "c9e2062a17ab",
+    "portfolio-images/images/fun62.webp": "76614aa212d1",
+    "portfolio-images/images/fun63.jpg": "ddcac9d4999e",
+    "portfolio-images/images/fun63.webp": "60be277255b4",
+    "portfolio-images/images/fun7.jpg": "10f8b75cc99a",
+    "portfolio-images/images/fun7.webp": "732fbe18b8cf",
+    "portfolio-images/images/fun8.jpg": "665e11c59e19",
+    "portfolio-images/images/fun8.webp": "3684622bfa1d",
+    "portfolio-images/images/fun9.jpg": "b136a1d9d1ef",
+    "portfolio-images/images/fun9.webp": "d91b3050d3a2",
+    "portfolio-images/images/hands-photo.jpg": "d6a2c1f8c63e",
+    "portfolio-images/images/hands-photo.webp": "b03cd4e36abe",
+    "portfolio-images/images/hobby-1.jpg": "658a736f1532",
+    "portfolio-images/images/hobby-1.webp": "a09226c16fdc",
+    "portfolio-images/images/hobby-2.jpg": "0a558dd3b648",
+    "portfolio-images/images/hobby-2.webp": "0cc182daafd0",
+    "portfolio-images/images/hobby-3.jpg": "9379e43417e5",
+    "portfolio-images/images/hobby-3.webp": "28bedb256828",
+    "portfolio-images/images/letter-mapping.jpg": "878d91fee573",
+    "portfolio-images/images/letter-mapping.webp": "51cf8c9faee3",
+    "portfolio-images/images/letter-mapping2.jpg": "85c547ba4e93",
+    "portfolio-images/images/letter-mapping2.webp": "44d873f873bf",
+    "portfolio-images/images/project1.jpg": "2fc15af297ec",
+    "portfolio-images/images/project1.webp": "824f91de371f",
+    "portfolio-images/images/project2.jpg": "b14a325906d8",
+    "portfolio-images/images/project2.webp": "0decb80000a8",
+    "portfolio-images/images/project3.jpg": "906ad5cd0311",
+    "portfolio-images/images/project3.webp": "71c0a9f0d81a",
+    "portfolio-images/images/qwerty-keyboard.jpg": "ca58458f6b82",
+    "portfolio-images/images/qwerty-keyboard.webp": "b4af7ba97e9e",
+    "portfolio-images/images/shift.jpg": "61af67634bb1",
+    "portfolio-images/images/shift.webp": "3fcc31eaf8ce",
+    "portfolio-images/images/tech-spec.jpg": "3f0737422195",
+    "portfolio-images/images/tech-spec.webp": "a7ad490e1957",
+    "portfolio-images/images/user.jpg": "87f4ee72bb6c",
+    "portfolio-images/images/user.webp": "bde5b1c4af69",
+    "portfolio-images/images/why-piano.jpg": "a0d63d220791",
+    "portfolio-images/images/why-piano.webp": "7b4d13215ae9",
+    "portfolio-images/project-images/brand-guidelines.jpg": "0810ceeb2cff",
+    "portfolio-images/project-images/brand-guidelines.webp": "37e0dd39a594",
+    "portfolio-images/project-images/figma-prototyping.jpg": "6c67d4a60f64",
+    "portfolio-images/project-images/figma-prototyping.webp": "1e3f7324b57a",
+    "portfolio-images/project-images/impact-1.jpg": "23748e66712a",
+    "portfolio-images/project-images/impact-1.webp": "2d4b22688330",
+    "portfolio-images/project-images/impact-2.jpg": "549dcf9f710c",
+    "portfolio-images/project-images/impact-2.webp": "3698249f7c28",
+    "portfolio-images/project-images/impact-3.jpg": "9e9be86c6d7d",
+    "portfolio-images/project-images/impact-3.webp": "5baf6bb033eb",
+    "portfolio-images/project-images/impact-4.jpg": "a10a3e5ca3c5",
+    "portfolio-images/project-images/impact-4.webp": "4fa50bb0ff46",
+    "portfolio-images/project-images/impact-5.jpg": "f73ee160aaa8",
+    "portfolio-images/project-images/impact-5.webp": "4c5602a2cf0c",
+    "portfolio-images/project-images/impact-6.jpg": "ffee85a2ee76",
+    "portfolio-images/project-images/impact-6.webp": "9bf7671588ac",
+    "portfolio-images/project-images/initial-research.jpg": "9e2887bda0b6",
+    "portfolio-images/project-images/initial-research.webp": "771ed901d88c",
+    "portfolio-images/project-images/insta-account-launch.jpg": "0e7184484b85",
+    "portfolio-images/project-images/insta-account-launch.webp": "3bee78e065e7",
+    "portfolio-images/project-images/kiosk-1.jpg": "7f05e1592956",
+    "portfolio-images/project-images/kiosk-1.webp": "5339417188a3",
+    "portfolio-images/project-images/kiosk-2.jpg": "3659fa67c2be",
+    "portfolio-images/project-images/kiosk-2.webp": "2f94b101ef5c",
+    "portfolio-images/project-images/kiosk-3.jpg": "9143485d1590",
+    "portfolio-images/project-images/kiosk-3.webp": "0876e7a598bd",
+    "portfolio-images/project-images/main.jpg": "30b9478f7a22",
+    "portfolio-images/project-images/main.webp": "fa5d670a8002",
+    "portfolio-images/project-images/moodboard.jpg": "8c5831354209",
+    "portfolio-images/project-images/moodboard.webp": "d7fc4a3c466f",
+    "portfolio-images/project-images/overview.jpg": "e82f51300645",
+    "portfolio-images/project-images/overview.webp": "22945da8f549",
+    "portfolio-images/project-images/proj3-overview2.jpg": "95448990b34d",
+    "portfolio-images/project-images/proj3-overview2.webp": "c8778f90ea63",
+    "portfolio-images/project-images/proj3-overview3.jpg": "1b1e26b84eb2",
+    "portfolio-images/project-images/proj3-overview3.webp": "1faffadc8031",
+    "portfolio-images/project-images/proj3-pd1.jpg": "a14874d2a3a9",
+    "portfolio-images/project-images/proj3-pd1.webp": "670468caad70",
+    "portfolio-images/project-images/proj3-research1.jpg": "0aee89bfba5f",
+    "portfolio-images/project-images/proj3-research1.webp": "709bd22ccd40",
+    "portfolio-images/project-images/proj3-research2.jpg": "b723378e6758",
+    "portfolio-images/project-images/proj3-research2.webp": "1ad065070196",
+    "portfolio-images/project-images/proj3-setback1.jpg": "bb111da40a2e",
+    "portfolio-images/project-images/proj3-setback1.webp": "abdb55a4db06",
+    "portfolio-images/project-images/step3pic.jpg": "28be6c96719e",
+    "portfolio-images/project-images/step3pic.webp": "0944ca0f6303",
+    "portfolio-images/project-images/waitlist-interface.jpg": "6a3f58291ee6",
+    "portfolio-images/project-images/waitlist-interface.webp": "9c7df2a2abc6"
+};
+
+const PRECACHE = `precache-${PRECACHE_VERSION}`;
+const PAGES_CACHE = 'pages-v1';
+const MEDIA_CACHE = 'media-v2';
+const FONTS_CACHE = 'fonts-v1';
+const GALLERY_CACHE = 'gallery-v2';
+const RUNTIME_CACHES = [PAGES_CACHE, MEDIA_CACHE, FONTS_CACHE, GALLERY_CACHE];
+
+const STORAGE_PATH = '/storage/v1/object/public/';
+const MEDIA_BUCKET = 'portfolio-images';
+const MEDIA_MAX_ENTRIES = 100;
+const MEDIA_MAX_BYTES = 26214400;
+const GALLERY_PATTERN = new RegExp('/images/fun\\d+\\.(webp|jpg|png)$');
+const GALLERY_MAX_ENTRIES = 60;
+const GALLERY_MAX_BYTES = 15728640;
+const REVISION_PARAM = 'sw-rev';
+
+const precacheUrls = new Set(
+    PRECACHE_MANIFEST.map(entry => new URL(entry.url, self.location).href)
+);
+
+self.addEventListener('install', event => {
+    event.waitUntil(precacheManifest().then(() => self.skipWaiting()));
+});
+
+async function precacheManifest() {
+    const cache = await caches.open(PRECACHE);
+    // The version only covers the manifest, so a new sw.js (e.g. after an image
+    // re-upload) can find this precache already complete
+    const cached = new Set((await cache.keys()).map(request => request.url));
+
+    // URLs that only differ by ?v= share a revision; download it once
+    const urlsByRevision = new Map();
+    for (const entry of PRECACHE_MANIFEST) {
+        const url = new URL(entry.url, self.location).href;
+        if (cached.has(url)) continue;
+        if (!urlsByRevision.has(entry.revision)) urlsByRevision.set(entry.revision, []);
+        urlsByRevision.get(entry.revision).push(url);
+    }
+
+    await Promise.all([...urlsByRevision.values()].map(async urls => {
+        const response = await fetch(urls[0], { cache: 'reload', mode: 'cors', credentials: 'same-origin' });
+        if (!response.ok) {
+            throw new Error(`Precache failed for ${urls[0]}: ${response.status}`);
+        }
+        const copies = urls.map(() => response.clone());
+        await Promise.all(urls.map((url, i) => cache.put(url, copies[i])));
+    }));
+}
+
+self.addEventListener('activate', event => {
+    // Drop precaches from older manifests and runtime caches from older layouts
+    event.waitUntil(
+        caches.keys().then(keys => Promise.all(
+            keys.filter(key => key.startsWith('precache-')
+                ? key !== PRECACHE
+                : !RUNTIME_CACHES.includes(key))
+                .map(key => caches.delete(key))
+        )).then(() => self.clients.claim())
+    );
+});
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET' || request.headers.has('range')) return;
+
+    const url = new URL(request.url);
+    url.hash = '';
+
+    if (precacheUrls.has(url.href)) {
+        event.respondWith(precached(request, url.href));
+    } else if (request.mode === 'navigate') {
+        event.respondWith(staleWhileRevalidate(request, PAGES_CACHE));
+    } else if (url.pathname.includes(STORAGE_PATH + MEDIA_BUCKET + '/')) {
+        if (GALLERY_PATTERN.test(url.pathname)) {
+            event.respondWith(storageImage(request, GALLERY_CACHE, GALLERY_MAX_ENTRIES, GALLERY_MAX_BYTES));
+        } else {
+            event.respondWith(storageImage(request, MEDIA_CACHE, MEDIA_MAX_ENTRIES, MEDIA_MAX_BYTES));
+        }
+    } else if (url.hostname === 'fonts.gstatic.com') {
+        // Font files are CORS requests with versioned, immutable URLs
+        event.respondWith(cacheFirst(request, FONTS_CACHE));
+    }
+});
+
+async function precached(request, key) {
+    const cached = await caches.match(key, { cacheName: PRECACHE });
+    return cached || fetch(request);
+}
+
+function fetchForCache(request, options = {}) {
+    // Cross-origin images are requested as no-cors; refetch with CORS so the
+    // cached response isn't opaque and its size can be read
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin && request.mode === 'no-cors') {
+        return fetch(request.url, { ...options, mode: 'cors', credentials: 'omit' });
+    }
+    return fetch(request, options);
+}
+
+async function cacheFirst(request, cacheName) {
+    const cache = await caches.open(cacheName);
+    const cached = await cache.match(request.url);
+    if (cached) return cached;
+
+    const response = await fetch(request);
+    if (response.ok) {
+        await cache.put(request.url, response.clone());
+    }
+    return response;
+}
+
+async function staleWhileRevalidate(request, cacheName, onCached) {
+    const cache = await caches.open(cacheName);
+    const cached = await cache.match(request.url);
+    const network = fetchForCache(request).then(async response => {
+        if (response.ok) {
+            await cache.put(request.url, response.clone());
+            if (onCached) await onCached(cache);
+        }
+        return response;
+    });
+
+    if (cached) {
+        network.catch(() => {});
+        return cached;
+    }
+    return network;
+}
+
+function storageKey(url) {
+    return decodeURIComponent(url.pathname.split(STORAGE_PATH)[1]);
+}
+
+function revisionedKey(url, revision) {
+    const key = new URL(url.href);
+    key.searchParams.set(REVISION_PARAM, revision);
+    return key.href;
+}
+
+async function storageImage(request, cacheName, maxEntries, maxBytes) {
+    const url = new URL(request.url);
+    url.hash = '';
+    const revision = MEDIA_REVISIONS[storageKey(url)];
+    const trim = cache => trimCache(cache, maxEntries, maxBytes);
+
+    // Images this build doesn't know about are revalidated on every use
+    if (!revision) {
+        return staleWhileRevalidate(request, cacheName, trim);
+    }
+
+    const cache = await caches.open(cacheName);
+    const key = revisionedKey(url, revision);
+    const cached = await cache.match(key);
+    if (cached) {
+        // Re-insert so cache.keys() order tracks recency
+        await cache.delete(key);
+        await cache.put(key, cached.clone());
+        return cached;
+    }
+
+    // The HTTP cache may still hold the previous upload under this URL
+    const response = await fetchForCache(request, { cache: 'no-cache' });
+    if (response.ok) {
+        await deleteOtherRevisions(cache, url);
+        await cache.put(key, response.clone());
+        await trim(cache);
+    }
+    return response;
+}
+
+async function deleteOtherRevisions(cache, url) {
+    const keys = await cache.keys();
+    await Promise.all(keys.filter(key => {
+        const cachedUrl = new URL(key.url);
+        cachedUrl.searchParams.delete(REVISION_PARAM);
+        return cachedUrl.href === url.href;
+    }).map(key => cache.delete(key)));
+}
+
+async function trimCache(cache, maxEntries, maxBytes) {
+    const keys = await cache.keys();
+    const sizes = await Promise.all(keys.map(async key => {
+        const response = await cache.match(key);
+        const length = Number(response.headers.get('content-length'));
+        return length || (await response.blob()).size;
+    }));
+
+    let total = sizes.reduce((sum, size) => sum + size, 0);
+    let count = keys.length;
+    // Oldest entries come first
+    for (let i = 0; i < keys.length && (count > maxEntries || total > maxBytes); i++) {
+        await cache.delete(keys[i]);
+        total -= sizes[i];
+        count--;
+    }
+}
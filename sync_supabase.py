@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Reconcile Supabase Storage buckets with the local optimized build
+
+Lists every object in the portfolio buckets, compares it with the files in
+optimized/ by size and MD5 (Supabase reports the MD5 as the object's eTag),
+upserts only what changed and deletes objects that no longer exist locally.
+Runs as a dry run unless --apply is passed.
+"""
+
+import argparse
+import re
+from pathlib import Path
+
+import requests
+
+from media_catalog import (CATALOG_PATH, HTML_FILES, SYNC_SOURCES, file_md5,
+                           get_variant_by_path, list_optimized_files, open_catalog)
+from upload_to_supabase import SUPABASE_URL, SUPABASE_ANON_KEY, upload_file
+
+# Supabase caps list responses at 1000 objects per call
+LIST_PAGE_SIZE = 1000
+DELETE_BATCH_SIZE = 100
+
+def get_headers():
+    """Headers for Storage API calls"""
+    return {
+        "Authorization": f"Bearer {SUPABASE_ANON_KEY}",
+        "apikey": SUPABASE_ANON_KEY
+    }
+
+def list_bucket(bucket_name, prefix=""):
+    """List every object under prefix, following folders and pages"""
+    url = f"{SUPABASE_URL}/storage/v1/object/list/{bucket_name}"
+    objects = {}
+    offset = 0
+
+    while True:
+        body = {
+            "prefix": prefix,
+            "limit": LIST_PAGE_SIZE,
+            "offset": offset,
+            "sortBy": {"column": "name", "order": "asc"}
+        }
+        response = requests.post(url, headers=get_headers(), json=body)
+        response.raise_for_status()
+        page = response.json()
+
+        for entry in page:
+            key = f"{prefix}/{entry['name']}" if prefix else entry["name"]
+            if entry.get("id") is None:
+                # Folders come back without an id
+                objects.update(list_bucket(bucket_name, key))
+            else:
+                metadata = entry.get("metadata") or {}
+                objects[key] = {
+                    "size": metadata.get("size"),
+                    "etag": (metadata.get("eTag") or "").strip('"')
+                }
+
+        if len(page) < LIST_PAGE_SIZE:
+            return objects
+        offset += LIST_PAGE_SIZE
+
+def local_md5(catalog, item, stat):
+    """MD5 from the media catalog when it is current, otherwise hash the file"""
+    if catalog is not None:
+        row = get_variant_by_path(catalog, item.as_posix())
+        if row is not None and row["mtime"] == stat.st_mtime and row["bytes"] == stat.st_size:
+            return row["md5"]
+    return file_md5(item)
+
+def scan_local(dir_path, base_path, catalog=None):
+    """Map remote keys to local files for one build directory"""
+    files = {}
+    for item, relative_path in list_optimized_files(dir_path):
+        key = f"{base_path}/{relative_path}"
+        stat = item.stat()
+        files[key] = {"path": item, "size": stat.st_size, "md5": local_md5(catalog, item, stat)}
+    return files
+
+def find_referenced_keys(bucket_name):
+    """Keys the HTML pages point at, which must never be deleted"""
+    pattern = re.compile(rf'/storage/v1/object/public/{re.escape(bucket_name)}/([^"\'\s)?]+)')
+    keys = set()
+    for html_file in HTML_FILES:
+        if Path(html_file).exists():
+            with open(html_file, 'r', encoding='utf-8') as f:
+                keys.update(pattern.findall(f.read()))
+    return keys
+
+def is_changed(local, remote):
+    """Compare a local file with its remote object"""
+    if remote["size"] != local["size"]:
+        return True
+    etag = remote["etag"]
+    # Multipart uploads get a "<hash>-<parts>" eTag that isn't a plain MD5
+    if etag and "-" not in etag:
+        return etag != local["md5"]
+    return False
+
+def build_plan(bucket_name, sources, catalog=None):
+    """Diff one bucket against its local directories"""
+    plan = {"upload": [], "unchanged": 0, "delete": [], "kept": []}
+    remote = list_bucket(bucket_name)
+    referenced = find_referenced_keys(bucket_name)
+
+    for dir_path, base_path in sources:
+        local = scan_local(dir_path, base_path, catalog)
+
+        for key, info in local.items():
+            if key not in remote:
+                plan["upload"].append((info["path"], key, "new"))
+            elif is_changed(info, remote[key]):
+                plan["upload"].append((info["path"], key, "changed"))
+            else:
+                plan["unchanged"] += 1
+
+        # Only prune inside prefixes we actually have a local build for
+        for key in remote:
+            if not key.startswith(f"{base_path}/") or key in local:
+                continue
+            if key in referenced:
+                plan["kept"].append(key)
+            else:
+                plan["delete"].append(key)
+
+    return plan
+
+def delete_objects(bucket_name, keys):
+    """Delete objects in batches, returns how many were removed"""
+    url = f"{SUPABASE_URL}/storage/v1/object/{bucket_name}"
+    deleted = 0
+
+    for i in range(0, len(keys), DELETE_BATCH_SIZE):
+        batch = keys[i:i + DELETE_BATCH_SIZE]
+        try:
+            response = requests.delete(url, headers=get_headers(), json={"prefixes": batch})
+            if response.status_code == 200:
+                deleted += len(batch)
+                for key in batch:
+                    print(f"🗑️  Deleted: {key}")
+            else:
+                print(f"❌ Failed to delete batch: {response.status_code} - {response.text}")
+        except Exception as e:
+            print(f"❌ Error deleting batch: {e}")
+
+    return deleted
+
+def print_plan(bucket_name, plan):
+    """Show what a sync would do for one bucket"""
+    print(f"\n📦 {bucket_name}")
+    for _, key, reason in plan["upload"]:
+        print(f"  ⬆️  upload ({reason}): {key}")
+    for key in plan["delete"]:
+        print(f"  🗑️  delete (orphan): {key}")
+    for key in plan["kept"]:
+        print(f"  📌 keep (referenced by HTML): {key}")
+    print(f"  {len(plan['upload'])} to upload, {len(plan['delete'])} to delete, "
+          f"{plan['unchanged']} unchanged, {len(plan['kept'])} kept")
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync optimized/ with Supabase Storage")
+    parser.add_argument("--apply", action="store_true", help="execute the plan instead of a dry run")
+    args = parser.parse_args()
+
+    print("🔄 Reconciling Supabase Storage with optimized/...")
+
+    if not Path("optimized").exists():
+        print("❌ Optimized directory not found. Run compression scripts first.")
+        return
+
+    # Group local directories by bucket so each bucket is listed once
+    buckets = {}
+    for dir_path, bucket_name, base_path in SYNC_SOURCES:
+        if Path(dir_path).exists():
+            buckets.setdefault(bucket_name, []).append((dir_path, base_path))
+        else:
+            print(f"⚠️  Skipping {dir_path}: not found")
+
+    # Reuse hashes from media_catalog.py instead of re-reading every file
+    catalog = open_catalog() if Path(CATALOG_PATH).exists() else None
+
+    plans = {}
+    for bucket_name, sources in buckets.items():
+        try:
+            plans[bucket_name] = build_plan(bucket_name, sources, catalog)
+        except Exception as e:
+            print(f"❌ Error listing {bucket_name}: {e}")
+            return
+        print_plan(bucket_name, plans[bucket_name])
+
+    if not args.apply:
+        print("\n📝 Dry run only. Re-run with --apply to execute this plan.")
+        return
+
+    uploaded = 0
+    deleted = 0
+    for bucket_name, plan in plans.items():
+        for file_path, key, _ in plan["upload"]:
+            if upload_file(file_path, bucket_name, key):
+                uploaded += 1
+        deleted += delete_objects(bucket_name, plan["delete"])
+
+    print(f"\n✅ Sync complete! Uploaded {uploaded} files, deleted {deleted} orphans")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Tests for sync_supabase.py against the local Storage emulator
+
+Run with:
+    python3 -m pytest test_sync_supabase.py
+"""
+
+import hashlib
+import sys
+from pathlib import Path
+
+import pytest
+
+import sync_supabase
+import upload_to_supabase
+from media_catalog import build_catalog, open_catalog
+from supabase_emulator import StorageEmulator, start_emulator
+
+BUCKET = "portfolio-images"
+
+@pytest.fixture
+def emulator(monkeypatch, tmp_path):
+    """Emulator both the sync and upload code talk to, run from an empty tree"""
+    emulator = StorageEmulator()
+    server, base_url = start_emulator(emulator)
+    monkeypatch.setattr(sync_supabase, "SUPABASE_URL", base_url)
+    monkeypatch.setattr(upload_to_supabase, "SUPABASE_URL", base_url)
+    # Starts without media_catalog.db, so local files come from a directory walk
+    monkeypatch.chdir(tmp_path)
+    Path("optimized/images").mkdir(parents=True)
+    yield emulator
+    server.shutdown()
+    server.server_close()
+
+def write_local(name, data):
+    path = Path("optimized/images") / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+def put_remote(emulator, key, data):
+    emulator.put(BUCKET, key, data, "image/webp", upsert=True)
+
+def remote_keys(emulator):
+    return sorted(key for bucket_name, key in emulator.objects if bucket_name == BUCKET)
+
+def run_sync(monkeypatch, *args):
+    monkeypatch.setattr(sys, "argv", ["sync_supabase.py", *args])
+    sync_supabase.main()
+
+@pytest.mark.parametrize("count", [6, 7])
+def test_list_bucket_pages_past_limit(emulator, monkeypatch, count):
+    monkeypatch.setattr(sync_supabase, "LIST_PAGE_SIZE", 3)
+    for i in range(count):
+        put_remote(emulator, f"images/file{i}.webp", b"x" * i)
+    put_remote(emulator, "images/nested/deep.webp", b"deep")
+
+    objects = sync_supabase.list_bucket(BUCKET)
+
+    assert sorted(objects) == sorted([f"images/file{i}.webp" for i in range(count)]
+                                     + ["images/nested/deep.webp"])
+    assert objects["images/file2.webp"] == {"size": 2, "etag": hashlib.md5(b"xx").hexdigest()}
+
+def test_plan_uploads_only_new_and_changed(emulator):
+    write_local("same.webp", b"same")
+    write_local("changed.webp", b"new content")
+    write_local("new.webp", b"new")
+    put_remote(emulator, "images/same.webp", b"same")
+    # Same size, different bytes: only the MD5 tells them apart
+    put_remote(emulator, "images/changed.webp", b"old content")
+
+    plan = sync_supabase.build_plan(BUCKET, [("optimized/images", "images")])
+
+    assert sorted((key, reason) for _, key, reason in plan["upload"]) == [
+        ("images/changed.webp", "changed"), ("images/new.webp", "new")]
+    assert plan["unchanged"] == 1
+    assert plan["delete"] == []
+
+def test_apply_upserts_changed_files(emulator, monkeypatch):
+    write_local("changed.webp", b"new content")
+    put_remote(emulator, "images/changed.webp", b"old content")
+
+    run_sync(monkeypatch, "--apply")
+
+    assert emulator.get(BUCKET, "images/changed.webp")["data"] == b"new content"
+
+def test_referenced_keys_are_kept(emulator, monkeypatch):
+    write_local("local.webp", b"local")
+    put_remote(emulator, "images/local.webp", b"local")
+    put_remote(emulator, "images/referenced.jpg", b"ref")
+    put_remote(emulator, "images/orphan.jpg", b"orphan")
+    # Outside any local prefix, so never pruned
+    put_remote(emulator, "other/elsewhere.jpg", b"other")
+    Path("index.html").write_text(
+        '<img src="https://example.supabase.co/storage/v1/object/public/'
+        f'{BUCKET}/images/referenced.jpg">', encoding="utf-8")
+
+    plan = sync_supabase.build_plan(BUCKET, [("optimized/images", "images")])
+    assert plan["kept"] == ["images/referenced.jpg"]
+    assert plan["delete"] == ["images/orphan.jpg"]
+
+    run_sync(monkeypatch, "--apply")
+
+    assert remote_keys(emulator) == ["images/local.webp", "images/referenced.jpg",
+                                     "other/elsewhere.jpg"]
+
+@pytest.mark.parametrize("orphans, batches", [(4, [2, 2]), (5, [2, 2, 1])])
+def test_orphans_deleted_in_batches(emulator, monkeypatch, orphans, batches):
+    monkeypatch.setattr(sync_supabase, "DELETE_BATCH_SIZE", 2)
+    for i in range(orphans):
+        put_remote(emulator, f"images/orphan{i}.webp", b"orphan")
+
+    seen = []
+    delete = emulator.delete
+
+    def record_delete(bucket_name, keys):
+        seen.append(len(keys))
+        return delete(bucket_name, keys)
+
+    monkeypatch.setattr(emulator, "delete", record_delete)
+
+    run_sync(monkeypatch, "--apply")
+
+    assert seen == batches
+    assert remote_keys(emulator) == []
+
+def test_dry_run_changes_nothing(emulator, monkeypatch):
+    write_local("changed.webp", b"new content")
+    write_local("new.webp", b"new")
+    put_remote(emulator, "images/changed.webp", b"old content")
+    put_remote(emulator, "images/orphan.webp", b"orphan")
+
+    run_sync(monkeypatch)
+
+    assert remote_keys(emulator) == ["images/changed.webp", "images/orphan.webp"]
+    assert emulator.get(BUCKET, "images/changed.webp")["data"] == b"old content"
+
+def test_catalog_changes_since_build_are_picked_up(emulator):
+    write_local("kept.webp", b"kept")
+    write_local("removed.webp", b"removed")
+    conn = open_catalog()
+    build_catalog(conn)
+    # Changed after the last build
+    Path("optimized/images/removed.webp").unlink()
+    write_local("added.webp", b"added")
+    put_remote(emulator, "images/added.webp", b"stale")
+
+    plan = sync_supabase.build_plan(BUCKET, [("optimized/images", "images")], conn)
+    conn.close()
+
+    assert sorted((key, reason) for _, key, reason in plan["upload"]) == [
+        ("images/added.webp", "changed"), ("images/kept.webp", "new")]
+    assert plan["delete"] == []
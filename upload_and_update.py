@@ -10,9 +10,11 @@ import json
 import re
 from pathlib import Path
 
-# You'll need to replace these with your actual Supabase credentials
-SUPABASE_URL = "YOUR_SUPABASE_URL"  # Replace with your actual URL
-SUPABASE_ANON_KEY = "YOUR_SUPABASE_ANON_KEY"  # Replace with your actual key
+from media_catalog import list_optimized_files
+
+# You'll need to replace these with your actual Supabase credentials (or set them in the environment)
+SUPABASE_URL = os.environ.get("SUPABASE_URL", "YOUR_SUPABASE_URL")  # Replace with your actual URL
+SUPABASE_ANON_KEY = os.environ.get("SUPABASE_ANON_KEY", "YOUR_SUPABASE_ANON_KEY")  # Replace with your actual key
 
 def upload_file_to_supabase(file_path, bucket_name, file_name):
     """Upload a single file to Supabase Storage"""
@@ -21,7 +23,9 @@ def upload_file_to_supabase(file_path, bucket_name, file_name):
         
         headers = {
             "Authorization": f"Bearer {SUPABASE_ANON_KEY}",
-            "Content-Type": get_content_type(file_path)
+            "Content-Type": get_content_type(file_path),
+            # Overwrite existing objects so re-uploads don't fail with a 400
+            "x-upsert": "true"
         }
         
         with open(file_path, 'rb') as f:
@@ -52,7 +56,7 @@ def get_content_type(file_path):
     return content_types.get(ext, 'application/octet-stream')
 
 def upload_directory(dir_path, bucket_name, base_path=""):
-    """Upload all files in a directory recursively"""
+    """Upload all media files in a directory recursively"""
     dir_path = Path(dir_path)
     
     if not dir_path.exists():
@@ -61,14 +65,11 @@ def upload_directory(dir_path, bucket_name, base_path=""):
     
     uploaded_files = []
     
-    for item in dir_path.iterdir():
-        if item.is_file():
-            file_name = f"{base_path}/{item.name}" if base_path else item.name
-            if upload_file_to_supabase(item, bucket_name, file_name):
-                uploaded_files.append((str(item), file_name))
-        elif item.is_dir():
-            new_base = f"{base_path}/{item.name}" if base_path else item.name
-            uploaded_files.extend(upload_directory(item, bucket_name, new_base))
+    # The file list comes from the media catalog (or a directory walk without one)
+    for item, relative_path in list_optimized_files(dir_path):
+        file_name = f"{base_path}/{relative_path}" if base_path else relative_path
+        if upload_file_to_supabase(item, bucket_name, file_name):
+            uploaded_files.append((str(item), file_name))
     
     return uploaded_files
 
@@ -104,9 +105,12 @@ def update_html_file(file_path, file_mappings):
             base_name = Path(local_path).stem
             ext = Path(local_path).suffix.lower()
             
-            # Try to find WebP version first, then fallback to JPEG
+            # Try to find WebP version first, then fall back to whichever of
+            # PNG (palette images) or JPEG was actually uploaded
             webp_url = supabase_url.replace(ext, '.webp')
-            jpg_url = supabase_url.replace(ext, '.jpg')
+            png_path = str(Path(local_path).with_suffix('.png'))
+            fallback_ext = '.png' if png_path in url_mapping else '.jpg'
+            jpg_url = supabase_url.replace(ext, fallback_ext)
             
             # Create responsive image with lazy loading
             new_img_tag = f'''<picture>
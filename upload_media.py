@@ -9,9 +9,11 @@ import requests
 import json
 from pathlib import Path
 
-# Configuration - you'll need to replace these with your actual values
-SUPABASE_URL = "YOUR_SUPABASE_URL"
-SUPABASE_ANON_KEY = "YOUR_SUPABASE_ANON_KEY"
+from media_catalog import list_optimized_files
+
+# Configuration - you'll need to replace these with your actual values (or set them in the environment)
+SUPABASE_URL = os.environ.get("SUPABASE_URL", "YOUR_SUPABASE_URL")
+SUPABASE_ANON_KEY = os.environ.get("SUPABASE_ANON_KEY", "YOUR_SUPABASE_ANON_KEY")
 
 def upload_file_to_supabase(file_path, bucket_name, file_name):
     """Upload a single file to Supabase Storage"""
@@ -20,7 +22,9 @@ def upload_file_to_supabase(file_path, bucket_name, file_name):
         
         headers = {
             "Authorization": f"Bearer {SUPABASE_ANON_KEY}",
-            "Content-Type": get_content_type(file_path)
+            "Content-Type": get_content_type(file_path),
+            # Overwrite existing objects so re-uploads don't fail with a 400
+            "x-upsert": "true"
         }
         
         with open(file_path, 'rb') as f:
@@ -51,20 +55,17 @@ def get_content_type(file_path):
     return content_types.get(ext, 'application/octet-stream')
 
 def upload_directory(dir_path, bucket_name, base_path=""):
-    """Upload all files in a directory recursively"""
+    """Upload all media files in a directory recursively"""
     dir_path = Path(dir_path)
     
     if not dir_path.exists():
         print(f"❌ Directory not found: {dir_path}")
         return
     
-    for item in dir_path.iterdir():
-        if item.is_file():
-            file_name = f"{base_path}/{item.name}" if base_path else item.name
-            upload_file_to_supabase(item, bucket_name, file_name)
-        elif item.is_dir():
-            new_base = f"{base_path}/{item.name}" if base_path else item.name
-            upload_directory(item, bucket_name, new_base)
+    # The file list comes from the media catalog (or a directory walk without one)
+    for item, relative_path in list_optimized_files(dir_path):
+        file_name = f"{base_path}/{relative_path}" if base_path else relative_path
+        upload_file_to_supabase(item, bucket_name, file_name)
 
 def main():
     print("🚀 Starting upload to Supabase Storage...")